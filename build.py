@@ -40,6 +40,7 @@ def build_executable():
         "--icon=assets/images/unicorn.png",  # App icon
         "--add-data=assets/images/*.png;assets/images",  # Bundle images
         "--add-data=assets/sounds/*.mp3;assets/sounds",  # Bundle sounds
+        "--collect-submodules=operations",  # Problem types are imported lazily
         "src/unicorn_math_adventures.py"
     ]
     
@@ -61,7 +62,8 @@ def build_executable():
         f.write("- Use number keys to enter answers\n")
         f.write("- Use space and forward slash for fractions (e.g., '1 1/3')\n")
         f.write("- Press Enter to submit your answer\n")
-        f.write("- Press Backspace to correct mistakes\n\n")
+        f.write("- Press Backspace to correct mistakes\n")
+        f.write("- Press F11 to toggle fullscreen\n\n")
         f.write("Important:\n")
         f.write("- High scores are saved automatically in your Documents folder\n")
         f.write("- The game can be moved anywhere on your computer\n\n")
@@ -0,0 +1,228 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+ENV_VAR = "UNICORN_PROFILE_ALLOCATIONS"
+FLAG = "--profile-allocations"
+WARMUP_FRAMES = 30  # Frames after entering a screen that are left out (layers and widgets are built then)
+REPORT_EVERY = 300  # Steady-state frames between reports
+TOP_LINES = 8
+
+# Steady-state budgets per screen for the headless check:
+# (net new memory blocks per frame, transient KiB per frame)
+BUDGETS = {
+    "main_menu": (1.0, 8),
+    "show_game_over": (1.0, 8),
+    "game_loop": (1.0, 16),
+}
+
+class ScreenStats:
+    """Steady-state allocation and GC totals for one screen loop."""
+
+    def __init__(self, screen: str):
+        self.screen = screen
+        self.frames = 0
+        self.net_blocks = 0
+        self.transient_bytes = 0
+        self.max_transient_bytes = 0
+        self.gc_pauses = 0
+        self.gc_seconds = 0.0
+        self.max_gc_seconds = 0.0
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def add(self, net_blocks: int, transient_bytes: int, gc_pauses: List[float]) -> None:
+        self.frames += 1
+        self.net_blocks += net_blocks
+        self.transient_bytes += transient_bytes
+        self.max_transient_bytes = max(self.max_transient_bytes, transient_bytes)
+        for pause in gc_pauses:
+            self.gc_pauses += 1
+            self.gc_seconds += pause
+            self.max_gc_seconds = max(self.max_gc_seconds, pause)
+
+    @property
+    def blocks_per_frame(self) -> float:
+        return self.net_blocks / self.frames if self.frames else 0.0
+
+    @property
+    def transient_kib_per_frame(self) -> float:
+        return self.transient_bytes / self.frames / 1024 if self.frames else 0.0
+
+    def summary(self) -> str:
+        return (f"[{self.screen}] {self.frames} frames: {self.blocks_per_frame:+.2f} blocks/frame, "
+                f"{self.transient_kib_per_frame:.1f} KiB transient/frame "
+                f"(max {self.max_transient_bytes / 1024:.1f}), GC {self.gc_pauses} pauses, "
+                f"{self.gc_seconds * 1000:.2f} ms total, max {self.max_gc_seconds * 1000:.2f} ms")
+
+class AllocationProfiler:
+    """Per-frame allocation and GC pause tracking for the game's screen loops.
+
+    Each loop calls frame() once per frame with its name. Between two calls
+    the profiler measures the net change in allocated memory blocks, the
+    transient peak of traced memory above the frame's starting point
+    (everything allocated and freed within the frame), and the GC pauses
+    seen through gc.callbacks. Every REPORT_EVERY steady-state frames it
+    prints those totals and the source lines whose allocations grew most
+    since the last report, from tracemalloc snapshots.
+    """
+
+    def __init__(self, report_every: int = REPORT_EVERY, warmup: int = WARMUP_FRAMES, top: int = TOP_LINES):
+        self.report_every = report_every
+        self.warmup = warmup
+        self.top = top
+        self.stats: Dict[str, ScreenStats] = {}
+        self.script: Optional[Callable[[str, int], None]] = None  # Called after each frame (headless check)
+        self._screen = None
+        self._visit_frames = 0
+        self._gc_started = 0.0
+        self._gc_pauses: List[float] = []
+        self._blocks = 0
+        self._bytes = 0
+
+    @classmethod
+    def from_args(cls, argv: List[str]) -> Optional["AllocationProfiler"]:
+        """Return a started profiler if --profile-allocations or UNICORN_PROFILE_ALLOCATIONS=1 is set."""
+        if FLAG not in argv and os.environ.get(ENV_VAR, "") in ("", "0"):
+            return None
+        profiler = cls()
+        profiler.start()
+        return profiler
+
+    def start(self) -> None:
+        tracemalloc.start()
+        gc.callbacks.append(self._on_gc)
+        self._mark()
+
+    def stop(self) -> None:
+        """Stop tracing and print a final summary for each screen."""
+        if self._on_gc in gc.callbacks:
+            gc.callbacks.remove(self._on_gc)
+        for stats in self.stats.values():
+            print(stats.summary())
+        tracemalloc.stop()
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        if phase == "start":
+            self._gc_started = time.perf_counter()
+        else:
+            self._gc_pauses.append(time.perf_counter() - self._gc_started)
+
+    def _mark(self) -> None:
+        """Start measuring a new frame."""
+        tracemalloc.reset_peak()
+        self._bytes = tracemalloc.get_traced_memory()[0]
+        self._blocks = sys.getallocatedblocks()
+
+    def frame(self, screen: str) -> None:
+        """Record the frame that just ended in the named screen loop."""
+        # Differences only: a count kept in a local would still be alive at _mark() and skew the next frame
+        transient_bytes = tracemalloc.get_traced_memory()[1] - self._bytes
+        net_blocks = sys.getallocatedblocks() - self._blocks
+        if screen != self._screen:
+            self._screen = screen
+            self._visit_frames = 0
+        self._visit_frames += 1
+        if self._visit_frames > self.warmup:
+            stats = self.stats.get(screen)
+            if stats is None:
+                stats = self.stats[screen] = ScreenStats(screen)
+            stats.add(net_blocks, transient_bytes, self._gc_pauses)
+            if stats.frames % self.report_every == 0:
+                self.report(stats)
+        self._gc_pauses.clear()  # Reused rather than replaced, so the profiler itself allocates nothing
+        if self.script is not None:
+            self.script(screen, self._visit_frames)
+        self._mark()
+
+    def report(self, stats: ScreenStats) -> None:
+        """Print a screen's totals and the lines whose allocations grew since its last report."""
+        print(stats.summary())
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ))
+        if stats.snapshot is not None:
+            for diff in snapshot.compare_to(stats.snapshot, "lineno")[:self.top]:
+                if diff.count_diff or diff.size_diff:
+                    frame = diff.traceback[0]
+                    print(f"    {frame.filename}:{frame.lineno}: {diff.count_diff:+d} blocks, "
+                          f"{diff.size_diff / 1024:+.1f} KiB")
+        stats.snapshot = snapshot
+
+def check(frames: int = 150, budgets: Dict[str, tuple] = BUDGETS) -> bool:
+    """Drive each screen headlessly with scripted input and compare steady-state allocations to budgets.
+
+    Returns True if every screen is within its budget.
+    """
+    # No window or sound, and a throwaway home folder for profiles and reviews
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    os.environ["HOME"] = os.environ["USERPROFILE"] = tempfile.mkdtemp(prefix="unicorn-alloc-")
+    os.environ[ENV_VAR] = "1"
+    import pygame
+    import unicorn_math_adventures as game
+
+    profiler = game.allocation_profiler
+    profiler.report_every = frames
+
+    def click(rect: pygame.Rect) -> None:
+        pygame.event.post(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=rect.center, button=1))
+
+    def key(code: int, char: str = "") -> None:
+        pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=code, unicode=char, mod=0, scancode=0))
+
+    def script(screen: str, frame: int) -> None:
+        # Typical input: menu navigation, typing a name, typing and correcting an answer
+        if frame >= profiler.warmup + frames:
+            pygame.event.post(pygame.event.Event(pygame.QUIT))
+        elif screen == "main_menu":
+            if frame % 40 == 10:
+                click(game.MENU_LEVEL_SELECT_BUTTON)
+            elif frame % 40 == 30:
+                click(game.LEVEL_BACK_BUTTON)
+        elif frame % 10 == 0:
+            key(pygame.K_1, "1")
+        elif frame % 10 == 5:
+            key(pygame.K_BACKSPACE)
+
+    profiler.script = script
+    game.main_menu()
+    game.show_game_over(120, 7)
+    game.game_loop(1)
+    profiler.script = None
+
+    ok = True
+    for screen, (max_blocks, max_kib) in budgets.items():
+        stats = profiler.stats.get(screen)
+        if stats is None or stats.frames < frames:
+            print(f"FAIL {screen}: only {stats.frames if stats else 0} of {frames} frames ran")
+            ok = False
+            continue
+        within = stats.blocks_per_frame <= max_blocks and stats.transient_kib_per_frame <= max_kib
+        ok = ok and within
+        print(f"{'ok  ' if within else 'FAIL'} {screen}: {stats.blocks_per_frame:+.2f} blocks/frame "
+              f"(budget {max_blocks}), {stats.transient_kib_per_frame:.1f} KiB transient/frame (budget {max_kib})")
+    return ok
+
+def main():
+    """Allocation budget check: python src/alloc_profiler.py check"""
+    parser = argparse.ArgumentParser(description="Unicorn Math Adventures allocation checks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    check_parser = subparsers.add_parser("check", help="Fail if a screen allocates more per frame than its budget")
+    check_parser.add_argument("--frames", type=int, default=150, help="Steady-state frames measured per screen")
+    check_parser.add_argument("--max-blocks", type=float, default=None, help="Override every screen's block budget")
+    check_parser.add_argument("--max-kib", type=float, default=None, help="Override every screen's KiB budget")
+    args = parser.parse_args()
+
+    budgets = {screen: (args.max_blocks if args.max_blocks is not None else blocks,
+                        args.max_kib if args.max_kib is not None else kib)
+               for screen, (blocks, kib) in BUDGETS.items()}
+    sys.exit(0 if check(args.frames, budgets) else 1)
+
+if __name__ == "__main__":
+    main()
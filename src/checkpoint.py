@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+import time
+from typing import NamedTuple, Optional
+
+from game_state import GameState
+from operations import Problem
+
+CHECKPOINT_INTERVAL = 3.0  # Seconds between checkpoints while playing
+COMPACT_EVERY = 50  # Deltas appended before the journal is rewritten as one full record
+
+class Checkpoint(NamedTuple):
+    """A saved, unfinished session."""
+    player: str
+    elapsed_ms: int  # Session time already played (the timer offset)
+    state: GameState
+
+def snapshot_record(player: str, elapsed_ms: int, snapshot: tuple) -> dict:
+    """JSON-ready form of a GameState snapshot plus the player and timer offset."""
+    record = dict(zip(GameState.__slots__, snapshot))
+    record["level_bests"] = {str(level): best for level, best in record["level_bests"].items()}
+    record["player"] = player
+    record["elapsed_ms"] = elapsed_ms
+    return record
+
+def restore_state(record: dict) -> GameState:
+    """Rebuild a GameState from a checkpoint record."""
+    values = dict(record)
+    values["level_bests"] = {int(level): best for level, best in values["level_bests"].items()}
+    if values["problem"] is not None:
+        question, answer, operation, operands = values["problem"]
+        values["problem"] = Problem(question, answer, operation, tuple(operands))
+    values["message"] = ""
+    values["message_timer"] = 0  # Game ticks from the crashed run mean nothing now
+    return GameState.from_snapshot(tuple(values[name] for name in GameState.__slots__))
+
+def load_checkpoint(path: str) -> Optional[Checkpoint]:
+    """Replay a checkpoint journal (a full record followed by deltas), or return None if there is none."""
+    record = None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    if "full" in entry:
+                        record = entry["full"]
+                    elif record is not None:
+                        record.update(entry["delta"])
+                except (ValueError, KeyError, TypeError):
+                    break  # A torn last line from a crash
+    except OSError:
+        return None
+    if record is None:
+        return None
+    try:
+        return Checkpoint(record["player"], record["elapsed_ms"], restore_state(record))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+class SessionCheckpointer:
+    """Saves the running session every few seconds on a background thread.
+
+    The game loop calls save() every frame; it only takes a snapshot once the
+    interval has passed, and hands it to the writer thread, so frames never
+    wait on the disk. The writer keeps a JSON-lines journal: a full record
+    first, then only the fields that changed, appended and fsynced. The
+    journal is periodically rewritten as one full record through a temporary
+    file and os.replace, so a crash at any point leaves a readable
+    checkpoint.
+    """
+
+    def __init__(self, path: str, interval: float = CHECKPOINT_INTERVAL):
+        self.path = path
+        self.interval = interval
+        self._next_save = 0.0
+        self._pending = None  # Latest unwritten ("save", record) or ("discard",)
+        self._closed = False
+        self._condition = threading.Condition()
+        # Writer-thread state
+        self._written: Optional[dict] = None  # Record the journal currently holds
+        self._deltas = 0
+        self._thread = threading.Thread(target=self._run, name="session-checkpoint", daemon=True)
+        self._thread.start()
+
+    def save(self, state: GameState, player: str, elapsed_ms: int) -> None:
+        """Queue a checkpoint if the interval has passed since the last one."""
+        now = time.monotonic()
+        if now < self._next_save:
+            return
+        self._next_save = now + self.interval
+        self._submit(("save", player, elapsed_ms, state.snapshot()))
+
+    def discard(self) -> None:
+        """Forget the session (it ended normally) and delete the checkpoint."""
+        self._next_save = 0.0
+        self._submit(("discard",))
+
+    def close(self) -> None:
+        """Write anything still pending and stop the writer thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _submit(self, command: tuple) -> None:
+        with self._condition:
+            self._pending = command  # Only the newest checkpoint matters
+            self._condition.notify()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                command, self._pending = self._pending, None
+                closed = self._closed
+            if command is not None:
+                try:
+                    if command[0] == "save":
+                        self._write(snapshot_record(*command[1:]))
+                    else:
+                        self._remove()
+                except OSError as e:
+                    print(f"Couldn't write session checkpoint: {e}")
+            if closed:
+                return
+
+    def _write(self, record: dict) -> None:
+        written = self._written
+        same_session = (written is not None and written["started"] == record["started"]
+                        and written["player"] == record["player"])
+        if not same_session or self._deltas >= COMPACT_EVERY:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"full": record}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            self._deltas = 0
+        else:
+            delta = {name: value for name, value in record.items() if written.get(name) != value}
+            if not delta:
+                return
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"delta": delta}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            self._deltas += 1
+        self._written = record
+
+    def _remove(self) -> None:
+        self._written = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,7 @@
+# Family names for personalized messages and word problems
+FAMILY = {
+    "player": "Ella",
+    "sister": "Mila",
+    "dad": "Dad",
+    "mom": "Mom"
+}
@@ -0,0 +1,133 @@
+import copy
+import time
+import tracemalloc
+from datetime import datetime
+from operator import attrgetter
+
+class GameState:
+    """All per-session game state in a compact, typed __slots__ object.
+
+    Replaces the old per-session dict: attribute access avoids string-key
+    hashing on every read and write, and without a per-instance __dict__ a
+    session takes a fraction of the memory, so very many can be kept around
+    for headless simulation or hosting. snapshot() and restore() copy the
+    whole state as a flat tuple.
+    """
+    __slots__ = (
+        "streak",
+        "max_streak",
+        "progress",
+        "wrong_attempts",
+        "showing_answer",
+        "level",
+        "score",
+        "previous_question",
+        "user_answer",
+        "reward_count",
+        "message",
+        "message_timer",
+        "question",
+        "answer",
+        "problem",
+        "problems_since_review",
+        "started",
+        "starting_level",
+        "level_bests",
+        "operation_totals",
+    )
+
+    def __init__(self, starting_level: int = 1):
+        self.streak = 0
+        self.max_streak = 0
+        self.progress = 0.0
+        self.wrong_attempts = 0
+        self.showing_answer = False
+        self.level = starting_level
+        self.score = 0
+        self.previous_question = ""
+        self.user_answer = ""
+        self.reward_count = 0
+        self.message = ""
+        self.message_timer = 0
+        self.question = None
+        self.answer = None
+        self.problem = None
+        self.problems_since_review = 0
+        self.started = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.starting_level = starting_level
+        self.level_bests = {}  # level -> best streak this session
+        self.operation_totals = {}  # operation -> [attempts, correct, misses]
+
+    def snapshot(self) -> tuple:
+        """Return the state as a tuple of field values, independent of later changes."""
+        values = _get_fields(self)
+        # Only the two dicts are mutable; everything else is immutable or replaced wholesale
+        return values[:-2] + (dict(values[-2]), copy.deepcopy(values[-1]))
+
+    def restore(self, snapshot: tuple) -> None:
+        """Put the state back to a snapshot taken with snapshot()."""
+        for name, value in zip(self.__slots__, snapshot):
+            setattr(self, name, value)
+        self.level_bests = dict(self.level_bests)
+        self.operation_totals = copy.deepcopy(self.operation_totals)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple) -> "GameState":
+        state = cls.__new__(cls)
+        state.restore(snapshot)
+        return state
+
+_get_fields = attrgetter(*GameState.__slots__)
+
+def _dict_state(starting_level: int) -> dict:
+    """The dict layout GameState replaced, kept for the comparison below."""
+    return {
+        "streak": 0, "max_streak": 0, "progress": 0, "wrong_attempts": 0, "showing_answer": False,
+        "continue_button": None, "level": starting_level, "score": 0, "previous_question": "",
+        "user_answer": "", "reward_count": 0, "message": "", "message_timer": 0, "question": None,
+        "answer": None, "problem": None, "problems_since_review": 0,
+        "started": datetime.now().strftime("%Y-%m-%d %H:%M:%S"), "starting_level": starting_level,
+        "level_bests": {}, "operation_totals": {},
+    }
+
+def _answer_dict(state: dict) -> None:
+    state["score"] += 10 * (1 + state["streak"] // 5)
+    state["streak"] += 1
+    state["max_streak"] = max(state["streak"], state["max_streak"])
+    state["reward_count"] += 1
+    state["progress"] = state["streak"] / 10
+    state["message_timer"] += 2000
+    state["user_answer"] = ""
+
+def _answer_slots(state: GameState) -> None:
+    state.score += 10 * (1 + state.streak // 5)
+    state.streak += 1
+    state.max_streak = max(state.streak, state.max_streak)
+    state.reward_count += 1
+    state.progress = state.streak / 10
+    state.message_timer += 2000
+    state.user_answer = ""
+
+def compare(sessions: int = 100_000, answers: int = 10) -> None:
+    """Print memory and answer-update throughput for dict vs GameState sessions."""
+    for name, factory, answer in (("dict", _dict_state, _answer_dict), ("GameState", GameState, _answer_slots)):
+        tracemalloc.start()
+        states = [factory(1) for _ in range(sessions)]
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for _ in range(answers):
+            for state in states:
+                answer(state)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>9}: {memory / sessions:6.0f} bytes/session, {memory / 2**20:6.1f} MiB total, "
+              f"{sessions * answers / elapsed / 1e6:5.2f} M answers/s")
+    states = [GameState(1) for _ in range(sessions)]
+    start = time.perf_counter()
+    snapshots = [state.snapshot() for state in states]
+    for state, snapshot in zip(states, snapshots):
+        state.restore(snapshot)
+    print(f"snapshot+restore: {sessions / (time.perf_counter() - start) / 1e3:.0f} k sessions/s")
+
+if __name__ == "__main__":
+    compare()
@@ -1,28 +1,129 @@
+import argparse
+import hashlib
+import json
 import os
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 
-def convert_webp_to_png():
-    """Convert webp images to png format."""
+IMAGES_DIR = os.path.join("assets", "images")
+CACHE_FILE = os.path.join(IMAGES_DIR, ".build_cache.json")
+
+# Every size the game uses, plus 2x variants for high-DPI displays.
+# Outputs are named <stem>_<width>.png; None keeps the full-size <stem>.png.
+ASSET_SIZES = {
+    "unicorn.webp": [None, (150, 150), (300, 300)],
+    "rainbow.webp": [None, (100, 100), (200, 200)],
+}
+DEFAULT_SIZES = [None]  # Other artwork dropped into assets/images gets a full-size PNG
+PARALLEL_THRESHOLD = 4  # Use a process pool once this many sources need rebuilding
+
+def output_paths(src: str, sizes: list) -> list:
+    """Return (output path, size) pairs for a source image."""
+    stem = os.path.splitext(src)[0]
+    return [(os.path.join(IMAGES_DIR, f"{stem}.png" if size is None else f"{stem}_{size[0]}.png"), size)
+            for size in sizes]
+
+def outputs_key(outputs: list) -> list:
+    """JSON-comparable form of an output list, as stored in the build cache."""
+    return [[path, list(size) if size else None] for path, size in outputs]
+
+def file_hash(path: str) -> str:
+    """SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_asset(src_path: str, outputs: list) -> list:
+    """Decode a source once and write every requested size as an optimized PNG."""
+    with Image.open(src_path) as img:
+        img.load()
+        for png_path, size in outputs:
+            out = img if size is None else img.resize(size, Image.LANCZOS)
+            out.save(png_path, "PNG", optimize=True)
+            print(f"Saved {png_path}")
+    return [png_path for png_path, _ in outputs]
+
+def load_cache() -> dict:
+    try:
+        with open(CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache: dict) -> None:
+    tmp_path = CACHE_FILE + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp_path, CACHE_FILE)
+
+def is_current(entry: dict, src_path: str, outputs: list) -> bool:
+    """True if the outputs exist and were built from this exact source with these sizes."""
+    if not entry or entry.get("outputs") != outputs_key(outputs):
+        return False
+    if not all(os.path.exists(path) for path, _ in outputs):
+        return False
+    stat = os.stat(src_path)
+    if entry.get("mtime") == stat.st_mtime and entry.get("bytes") == stat.st_size:
+        return True
+    # Touched but possibly unchanged (e.g. a fresh checkout): fall back to the hash
+    if entry.get("sha256") == file_hash(src_path):
+        entry["mtime"], entry["bytes"] = stat.st_mtime, stat.st_size
+        return True
+    return False
+
+def convert_webp_to_png(force: bool = False, jobs: int = None) -> None:
+    """Convert webp artwork to every PNG size the game needs, skipping outputs that are up to date."""
     # Create assets directory structure
-    os.makedirs("assets/images", exist_ok=True)
-    os.makedirs("assets/sounds", exist_ok=True)
-    
-    # Convert images
-    images = {
-        "unicorn.webp": "unicorn.png",
-        "rainbow.webp": "rainbow.png"
-    }
-    
-    for src, dst in images.items():
-        src_path = os.path.join("assets/images", src)
-        if os.path.exists(src_path):
-            print(f"Converting {src_path} to {dst}...")
-            img = Image.open(src_path)
-            png_path = os.path.join("assets/images", dst)
-            img.save(png_path, "PNG")
-            print(f"Saved to {png_path}")
-        else:
+    os.makedirs(IMAGES_DIR, exist_ok=True)
+    os.makedirs(os.path.join("assets", "sounds"), exist_ok=True)
+
+    sources = dict.fromkeys(sorted(f for f in os.listdir(IMAGES_DIR) if f.endswith(".webp")), DEFAULT_SIZES)
+    sources.update(ASSET_SIZES)
+
+    cache = {} if force else load_cache()
+    # Forget artwork that has been removed
+    cache = {src: entry for src, entry in cache.items() if src in sources}
+    pending = {}
+    for src, sizes in sources.items():
+        src_path = os.path.join(IMAGES_DIR, src)
+        if not os.path.exists(src_path):
             print(f"Warning: Source image {src} not found")
+            continue
+        outputs = output_paths(src, sizes)
+        if is_current(cache.get(src), src_path, outputs):
+            continue
+        pending[src] = (src_path, outputs)
+
+    if not pending:
+        print("All images are up to date.")
+        save_cache(cache)
+        return
+
+    print(f"Converting {len(pending)} image(s)...")
+    if len(pending) >= PARALLEL_THRESHOLD and jobs != 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            futures = {src: pool.submit(build_asset, *args) for src, args in pending.items()}
+            for future in futures.values():
+                future.result()
+    else:
+        for src_path, outputs in pending.values():
+            build_asset(src_path, outputs)
+
+    for src, (src_path, outputs) in pending.items():
+        stat = os.stat(src_path)
+        cache[src] = {
+            "mtime": stat.st_mtime,
+            "bytes": stat.st_size,
+            "sha256": file_hash(src_path),
+            "outputs": outputs_key(outputs),
+        }
+    save_cache(cache)
 
 if __name__ == "__main__":
-    convert_webp_to_png()
+    parser = argparse.ArgumentParser(description="Build the game's PNG assets from webp artwork")
+    parser.add_argument("--force", action="store_true", help="Rebuild every image")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: one per CPU)")
+    args = parser.parse_args()
+    convert_webp_to_png(force=args.force, jobs=args.jobs)
@@ -0,0 +1,36 @@
+from typing import Dict
+
+# Levels and problems: the operation codes (see operations/) asked at each level
+LEVELS: Dict[int, Dict] = {
+    1: {
+        "operations": ["+", "-", "place"],  # place for place value
+        "range": (1, 20),
+        "description": "Addition & Subtraction",
+        "encouragement": [
+            # Filled in with FAMILY when shown, so they follow the chosen profile
+            "Great job, {player}!",
+            "{sister} would be proud!",
+            "Mom and Dad are amazed!"
+        ]
+    },
+    2: {
+        "operations": ["*", "/", "multi", "longdiv"],  # multi-step problems and multi-step division
+        "range": (1, 12),  # Times tables up to 12
+        "description": "Multiplication & Division",
+        "encouragement": [
+            "You're becoming a math wizard!",
+            "Keep up the great work!",
+            "Amazing progress!"
+        ]
+    },
+    3: {
+        "operations": ["frac", "dec", "complex", "exp"],  # fractions, decimals, complex problems, exponents
+        "range": (1, 100),
+        "description": "Fractions & Decimals",
+        "encouragement": [
+            "Spectacular solving!",
+            "You're a math superstar!",
+            "Incredible work!"
+        ]
+    }
+}
@@ -0,0 +1,162 @@
+"""Registry of problem types.
+
+Each operation is a module in this package that supplies its word-problem
+TEMPLATES, how to sample operands and how to compute the answer. Modules
+are only imported the first time they are used. The registry records the
+answer type, and with it the characters the player may type, so the game
+can check each keystroke without importing anything. Generating, rebuilding
+and checking a problem are all dictionary lookups, however many types are
+registered.
+
+A problem module provides:
+    TEMPLATES: list of str.format templates. FAMILY names ({player}, {sister},
+        ...) and the module's fields are available.
+    FIELDS: names for the operands in the templates, or a fields(operands)
+        function returning the template fields as a dict.
+    sample_operands(num_range) -> tuple
+    answer(operands) -> int or float
+    pick_template() -> int (optional, defaults to a uniform choice)
+    difficulty(operands) -> EASY, MEDIUM or HARD (optional, defaults to MEDIUM)
+    sample(num_range) -> (code, operands, template) (optional, replaces
+        sample_operands and pick_template, e.g. to delegate to another type)
+"""
+import importlib
+import random
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from family import FAMILY
+
+# Answer types and the characters each allows at the keyboard
+INTEGER = "integer"
+FRACTION = "fraction"  # Whole numbers, decimals, fractions and mixed numbers
+ANSWER_CHARS = {
+    INTEGER: frozenset("0123456789"),
+    FRACTION: frozenset("0123456789./ "),
+}
+FRACTION_HINT = "(Enter as mixed number like 1 1/3 or fraction like 4/3)"
+
+# Difficulty grades within a level, used by the problem bank
+EASY, MEDIUM, HARD = 1, 2, 3
+DIFFICULTIES = (EASY, MEDIUM, HARD)
+
+class Problem(NamedTuple):
+    """A generated problem, plus the operation and operands needed to ask it again."""
+    question: str
+    answer: float
+    operation: str
+    operands: tuple
+
+class Operation:
+    """A registered problem type; its module is imported on first use."""
+    __slots__ = ("code", "module_name", "answer_type", "allowed_chars", "hint", "_module")
+
+    def __init__(self, code: str, module_name: str, answer_type: str = INTEGER, hint: str = ""):
+        self.code = code
+        self.module_name = module_name
+        self.answer_type = answer_type
+        self.allowed_chars = ANSWER_CHARS[answer_type]
+        self.hint = hint
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            self._module = importlib.import_module(f"{__name__}.{self.module_name}")
+        return self._module
+
+    @property
+    def templates(self):
+        return self.module.TEMPLATES
+
+    def generate(self, num_range: Tuple[int, int]) -> Problem:
+        """Generate a random problem of this type."""
+        code, operands, template = self.sample(num_range)
+        return OPERATIONS[code].build(operands, template)
+
+    def sample(self, num_range: Tuple[int, int]) -> Tuple[str, tuple, int]:
+        """Draw the operation code, operands and template of a random problem without building it."""
+        module = self.module
+        sample = getattr(module, "sample", None)
+        if sample is not None:
+            return sample(num_range)
+        return self.code, tuple(module.sample_operands(num_range)), self.pick_template()
+
+    def pick_template(self) -> int:
+        module = self.module
+        pick_template = getattr(module, "pick_template", None)
+        return pick_template() if pick_template else random.randrange(len(module.TEMPLATES))
+
+    def difficulty(self, operands: tuple) -> int:
+        """Grade a problem EASY, MEDIUM or HARD for its level."""
+        difficulty = getattr(self.module, "difficulty", None)
+        return difficulty(operands) if difficulty else MEDIUM
+
+    def build(self, operands: tuple, template: Optional[int] = None) -> Problem:
+        """Build a problem from known operands, with a given or randomly picked template."""
+        module = self.module
+        if template is None:
+            template = self.pick_template()
+        fields = getattr(module, "fields", None)
+        values = fields(operands) if fields else dict(zip(module.FIELDS, operands))
+        question = module.TEMPLATES[template].format(**FAMILY, **values)
+        return Problem(question, module.answer(operands), self.code, tuple(operands))
+
+OPERATIONS: Dict[str, Operation] = {}
+
+def register(code: str, module_name: str, answer_type: str = INTEGER, hint: str = "") -> None:
+    """Add a problem type; module_name is a module in this package."""
+    OPERATIONS[code] = Operation(code, module_name, answer_type, hint)
+
+register("+", "addition")
+register("-", "subtraction")
+register("*", "multiplication")
+register("/", "division")
+register("multi", "multi_step")
+register("longdiv", "multi_step_division")
+register("place", "place_value")
+register("frac", "fractions", FRACTION, FRACTION_HINT)
+register("dec", "decimals", FRACTION, FRACTION_HINT)
+register("complex", "fraction_or_decimal", FRACTION, FRACTION_HINT)
+register("exp", "exponents")
+
+def plain_or_word_template(templates: list) -> int:
+    """Pick template 0 (the plain "a + b" form) half the time, otherwise a word problem."""
+    # Shared by the basic operations, whose TEMPLATES start with the plain form
+    return 0 if random.random() < 0.5 else random.randrange(1, len(templates))
+
+def type_char(operation: Operation, text: str, char: str) -> str:
+    """Return the answer text with char typed, or unchanged if the answer type doesn't allow it here."""
+    if char not in operation.allowed_chars:
+        return text
+    if char == " ":
+        # Only one space (for mixed numbers) and only if there's already some input
+        return text + " " if text and " " not in text else text
+    if char in "./":
+        # At most one decimal point or slash in the last part
+        parts = text.split()
+        return text + char if not parts or char not in parts[-1] else text
+    return text + char
+
+def check_answer(operation: Operation, text: str, answer) -> bool:
+    """Check typed text against the answer. Raises ValueError if it isn't a valid answer."""
+    if operation.answer_type == FRACTION:
+        # Handle fraction inputs (e.g., "4/3" or "1 1/3")
+        if "/" in text:
+            parts = text.split()
+            if len(parts) > 1:  # Mixed number (e.g., "1 1/3")
+                whole = int(parts[0])
+                num, denom = map(int, parts[1].split("/"))
+            else:  # Improper fraction (e.g., "4/3")
+                whole = 0
+                num, denom = map(int, text.split("/"))
+            if denom == 0:
+                raise ValueError("zero denominator")
+            # For fraction problems, compare the actual values
+            return abs(whole + num / denom - answer) < 0.01
+        value = float(text)
+    else:
+        value = int(text)
+    if isinstance(answer, float):
+        # For decimal problems, allow small differences
+        return abs(value - answer) < 0.01
+    return value == answer
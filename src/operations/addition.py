@@ -0,0 +1,28 @@
+import random
+
+from operations import EASY, HARD, MEDIUM, plain_or_word_template
+
+FIELDS = ("a", "b")
+TEMPLATES = [
+    "{a} + {b}",
+    "A unicorn collected {a} rainbows in the morning and {b} rainbows in the afternoon. How many rainbows did the unicorn collect in total?",
+    "{player} saw {a} stars on a rainbow cloud, then {b} more stars appeared. How many stars are there now?",
+    "{sister}'s dog buried {a} bones in the yard and found {b} more. How many bones does the dog have now?",
+    "A magical garden grew {a} sparkly flowers yesterday and {b} more today. How many sparkly flowers are there now?",
+    "{player} found {a} glitter pens in her backpack and {b} more in her desk. How many glitter pens does she have in total?",
+    "The unicorn school has {a} students in the morning class and {b} in the afternoon class. How many students are there altogether?",
+]
+
+def sample_operands(num_range):
+    return random.randint(*num_range), random.randint(*num_range)
+
+def answer(operands):
+    return operands[0] + operands[1]
+
+def difficulty(operands):
+    a, b = operands
+    carry = a % 10 + b % 10 >= 10
+    return HARD if carry and a + b > 20 else MEDIUM if carry or a + b > 20 else EASY
+
+def pick_template():
+    return plain_or_word_template(TEMPLATES)
@@ -0,0 +1,42 @@
+import random
+
+from operations import HARD, MEDIUM
+
+# Common price points that make sense: (total amount, unit cost)
+PRICES = [
+    (1.50, 0.25),
+    (2.00, 0.50),
+    (5.00, 1.25),
+    (10.00, 2.50),
+    (7.50, 1.50),
+]
+FIELDS = ("total", "unit")
+TEMPLATES = [
+    # Sticker buying
+    "{player} has ${total:.2f} and wants to buy unicorn stickers "
+    "that cost ${unit:.2f} each. How many stickers can she buy?",
+    # Ribbon measuring
+    "A magical ribbon is {total:.2f} meters long. If each unicorn needs "
+    "{unit:.2f} meters for their mane, how many unicorns can decorate their manes?",
+    # Crystal collecting
+    "{player} found {total:.2f} grams of magic fairy crystal dust. "
+    "If each necklace needs {unit:.2f} grams, how many necklaces can she make?",
+    # Rainbow paint
+    "The fairy store has {total:.2f} liters of rainbow paint. "
+    "If each cloud needs {unit:.2f} liters to become colorful, how many clouds can be painted?",
+    # Magic dust
+    "{sister} found {total:.2f} ounces of magic rainbow dust. "
+    "If each spell requires {unit:.2f} ounces, how many spells can she cast?",
+]
+
+def sample_operands(num_range):
+    return random.choice(PRICES)
+
+def answer(operands):
+    total, unit = operands
+    return int(total // unit)
+
+def difficulty(operands):
+    total, unit = operands
+    # Quarter units (0.25, 1.25) are harder than halves and wholes
+    return HARD if round(unit * 100) % 50 else MEDIUM
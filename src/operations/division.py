@@ -0,0 +1,29 @@
+import random
+
+from operations import EASY, HARD, MEDIUM, plain_or_word_template
+
+FIELDS = ("a", "b")
+TEMPLATES = [
+    "{a} ÷ {b}",
+    "A rainbow trail is {a} feet long. If {b} unicorns each paint an equal length, how many feet does each unicorn paint?",
+    "{player} has {a} sparkly stickers to share equally among {b} friends. How many stickers does each friend get?",
+    "Mom baked {a} rainbow cookies to pack equally into {b} gift boxes. How many cookies go in each box?",
+    "A group of {b} fairies needs to share {a} magic crystals equally. How many crystals does each fairy get?",
+    "There are {a} glitter crayons to be shared among {b} art stations. How many crayons should go to each station?",
+    "If {a} magical butterflies need to visit {b} flower gardens equally, how many butterflies will visit each garden?",
+]
+
+def sample_operands(num_range):
+    # Generate division problems that result in whole numbers
+    divisor = random.randint(1, 10)
+    quotient = random.randint(1, 10)
+    return divisor * quotient, divisor
+
+def answer(operands):
+    return operands[0] // operands[1]
+
+def difficulty(operands):
+    return EASY if operands[0] <= 25 else MEDIUM if operands[0] <= 64 else HARD
+
+def pick_template():
+    return plain_or_word_template(TEMPLATES)
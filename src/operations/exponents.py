@@ -0,0 +1,32 @@
+import random
+
+from operations import EASY, HARD, MEDIUM
+
+SUPERSCRIPTS = {2: "²", 3: "³"}
+TEMPLATES = [
+    "{base}{power}",
+    "What is {base} to the power of {exponent}?",
+    "{player} writes {expansion} on the magic board. What does it equal?",
+]
+
+def sample_operands(num_range):
+    exponent = random.choice((2, 3))
+    # Keep cubes small enough to work out by hand
+    return random.randint(2, 12 if exponent == 2 else 6), exponent
+
+def fields(operands):
+    base, exponent = operands
+    return {
+        "base": base,
+        "exponent": exponent,
+        "power": SUPERSCRIPTS[exponent],
+        "expansion": " × ".join([str(base)] * exponent),
+    }
+
+def answer(operands):
+    base, exponent = operands
+    return base ** exponent
+
+def difficulty(operands):
+    power = answer(operands)
+    return EASY if power <= 50 else MEDIUM if power <= 200 else HARD
@@ -0,0 +1,10 @@
+import random
+
+from operations import OPERATIONS
+
+# Complex problems are a fraction or a decimal problem; the generated problem
+# keeps the real operation so it is checked and reviewed as that type
+TEMPLATES = []
+
+def sample(num_range):
+    return OPERATIONS[random.choice(("frac", "dec"))].sample(num_range)
@@ -0,0 +1,48 @@
+import random
+
+from operations import EASY, HARD, MEDIUM
+
+# Common fractions that make sense in recipes and measurements
+FRACTIONS = [
+    (1, 2),  # half
+    (1, 4),  # quarter
+    (3, 4),  # three-quarters
+    (1, 3),  # third
+    (2, 3),  # two-thirds
+]
+TEMPLATES = [
+    # Recipe scaling
+    "A recipe calls for {fraction} cup of sugar. "
+    "If {player} wants to make {multiplier} times the recipe, "
+    "how many cups of sugar does she need?",
+    # Pizza sharing
+    "Each fairy eats {fraction} of a magical pizza. "
+    "If there are {multiplier} fairies, how many whole pizzas are needed?",
+    # Paint mixing
+    "To make sparkly paint, you need {fraction} cup of glitter per batch. "
+    "If you want to make {multiplier} batches, how many cups of glitter do you need?",
+    # Garden planning
+    "Each rainbow flower needs {fraction} cup of magical water daily. "
+    "If you have {multiplier} rainbow flowers, how many cups of water do you need?",
+    # Potion making
+    "A unicorn potion requires {fraction} cup of starlight. "
+    "To make {multiplier} potions, how many cups of starlight are needed?",
+]
+
+def sample_operands(num_range):
+    numerator, denominator = random.choice(FRACTIONS)
+    return numerator, denominator, random.randint(2, 4)
+
+def fields(operands):
+    numerator, denominator, multiplier = operands
+    return {"fraction": f"{numerator}/{denominator}", "multiplier": multiplier}
+
+def answer(operands):
+    numerator, denominator, multiplier = operands
+    return (numerator / denominator) * multiplier
+
+def difficulty(operands):
+    numerator, denominator, multiplier = operands
+    if numerator * multiplier % denominator == 0:
+        return EASY  # Comes out to whole cups or pizzas
+    return HARD if denominator == 3 else MEDIUM
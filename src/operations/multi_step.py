@@ -0,0 +1,22 @@
+import random
+
+from operations import EASY, HARD, MEDIUM
+
+FIELDS = ("pencils", "pencil_cost", "notebooks", "notebook_cost")
+TEMPLATES = [
+    # Buy multiple items with different quantities and prices
+    "{player} buys {pencils} magical pencils for {pencil_cost} coins each "
+    "and {notebooks} notebooks for {notebook_cost} coins each. "
+    "How many coins did she spend in total?",
+]
+
+def sample_operands(num_range):
+    return random.randint(2, 5), random.randint(2, 5), random.randint(2, 4), random.randint(3, 6)
+
+def answer(operands):
+    pencils, pencil_cost, notebooks, notebook_cost = operands
+    return (pencils * pencil_cost) + (notebooks * notebook_cost)
+
+def difficulty(operands):
+    total = answer(operands)
+    return EASY if total <= 20 else MEDIUM if total <= 35 else HARD
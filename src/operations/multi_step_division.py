@@ -0,0 +1,26 @@
+import random
+
+from operations import EASY, HARD, MEDIUM
+
+FIELDS = ("total", "groups", "give")
+TEMPLATES = [
+    "{player} has {total} stickers to share equally among {groups} friends. "
+    "Then each friend gives {give} of their stickers to {sister}. How many stickers does each friend have left?",
+    "A unicorn bakery makes {total} cupcakes and packs them equally into {groups} boxes. "
+    "Then {give} cupcakes are eaten from each box. How many cupcakes are left in each box?",
+    "{total} magic crystals are shared equally by {groups} fairies. Each fairy uses {give} crystals "
+    "for a spell. How many crystals does each fairy have left?",
+]
+
+def sample_operands(num_range):
+    groups = random.randint(2, 6)
+    each = random.randint(3, 10)
+    return groups * each, groups, random.randint(1, each - 1)
+
+def answer(operands):
+    total, groups, give = operands
+    return total // groups - give
+
+def difficulty(operands):
+    total = operands[0]
+    return EASY if total <= 20 else MEDIUM if total <= 40 else HARD
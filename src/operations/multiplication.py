@@ -0,0 +1,28 @@
+import random
+
+from operations import EASY, HARD, MEDIUM, plain_or_word_template
+
+FIELDS = ("a", "b")
+TEMPLATES = [
+    "{a} × {b}",
+    "There are {a} unicorns at a party, and each unicorn brings {b} magical cupcakes. How many cupcakes are there in total?",
+    "{player} buys {a} packs of dog treats with {b} treats in each pack. How many treats does she have in total?",
+    "If each rainbow has {b} stars and you see {a} rainbows, how many stars are there in total?",
+    "Each fairy has {b} magic crystals and there are {a} fairies. How many magic crystals are there altogether?",
+    "If each unicorn can grant {b} wishes per day and there are {a} unicorns, how many wishes can be granted in total?",
+    "{player} plants {a} rows of magical flowers with {b} flowers in each row. How many flowers did she plant in total?",
+]
+
+def sample_operands(num_range):
+    # Times tables up to the top of the level's range
+    return random.randint(1, num_range[1]), random.randint(1, num_range[1])
+
+def answer(operands):
+    return operands[0] * operands[1]
+
+def difficulty(operands):
+    product = operands[0] * operands[1]
+    return EASY if product <= 25 else MEDIUM if product <= 64 else HARD
+
+def pick_template():
+    return plain_or_word_template(TEMPLATES)
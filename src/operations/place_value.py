@@ -0,0 +1,28 @@
+import random
+
+from operations import EASY
+
+PLACES = ["ones", "tens", "hundreds", "thousands"]
+TEMPLATES = [
+    "Digit in the {place} place of {number:,}",
+    "{player} wrote the magic number {number:,} on a rainbow. Which digit is in the {place} place?",
+    "A unicorn counted {number:,} sparkles in the sky. What digit is in the {place} place?",
+    "The fairy library has {number:,} books. Which digit is in the {place} place of that number?",
+]
+
+def sample_operands(num_range):
+    number = random.randint(100, 9999)
+    return number, random.randrange(len(str(number)))
+
+def fields(operands):
+    number, place = operands
+    return {"number": number, "place": PLACES[place]}
+
+def answer(operands):
+    number, place = operands
+    return number // 10 ** place % 10
+
+def difficulty(operands):
+    number, place = operands
+    # Four-digit numbers and the hundreds/thousands places are harder to read
+    return EASY + (number >= 1000) + (place >= 2)
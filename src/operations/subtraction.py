@@ -0,0 +1,31 @@
+import random
+
+from operations import EASY, HARD, MEDIUM, plain_or_word_template
+
+FIELDS = ("a", "b")
+TEMPLATES = [
+    "{a} - {b}",
+    "{player} has {a} magical cupcakes and shares {b} with {sister}. How many cupcakes does {player} have left?",
+    "There are {a} unicorns at a party, but {b} unicorns had to leave early. How many unicorns are still at the party?",
+    "A rainbow trail is {a} feet long. If {b} feet are covered by clouds, how many feet can you still see?",
+    "A fairy has {a} magic wands but {b} of them lost their sparkle. How many sparkly wands are left?",
+    "{player} collected {a} seashells at the beach, but gave {b} to her friend. How many seashells does she have now?",
+    "There were {a} butterflies in the garden, but {b} flew away. How many butterflies are still there?",
+]
+
+def sample_operands(num_range):
+    num1 = random.randint(*num_range)
+    num2 = random.randint(*num_range)
+    # Ensure no negative results
+    return max(num1, num2), min(num1, num2)
+
+def answer(operands):
+    return operands[0] - operands[1]
+
+def difficulty(operands):
+    a, b = operands
+    borrow = a % 10 < b % 10
+    return HARD if borrow and b >= 10 else MEDIUM if borrow or b >= 10 else EASY
+
+def pick_template():
+    return plain_or_word_template(TEMPLATES)
@@ -0,0 +1,135 @@
+import math
+from typing import List, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+# Rainbow colors used for sparkles and star bursts
+RAINBOW_COLORS = [
+    (255, 89, 94),    # red
+    (255, 146, 76),   # orange
+    (255, 202, 58),   # yellow
+    (138, 201, 38),   # green
+    (25, 130, 196),   # blue
+    (147, 112, 219),  # purple
+]
+SPRITE_SIZES = (6, 10, 16)  # Sprites shrink through these sizes as particles age
+MAX_PARTICLES = 400  # Hard cap on live particles, whatever the triggers ask for
+TIMESTEP = 1 / 60  # Fixed simulation step in seconds
+MAX_STEPS_PER_FRAME = 4  # Drop simulation time rather than fall further behind
+GRAVITY = 260.0  # Pixels per second squared
+
+def make_star_sprite(color: Tuple[int, int, int], size: int) -> pygame.Surface:
+    """Pre-render a four-pointed sparkle star of the given color and size."""
+    sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+    center = size / 2
+    inner = max(1.0, size / 6)
+    points = []
+    for i in range(8):
+        angle = i * math.pi / 4
+        radius = center if i % 2 == 0 else inner
+        points.append((center + radius * math.cos(angle), center + radius * math.sin(angle)))
+    pygame.draw.polygon(sprite, color, points)
+    pygame.draw.circle(sprite, (255, 255, 255), (int(center), int(center)), max(1, size // 6))
+    return sprite.convert_alpha()
+
+class ParticleSystem:
+    """Fixed-capacity particle pool stored in preallocated NumPy arrays.
+
+    Particles are never allocated or freed: emitting reuses dead slots and
+    silently drops anything past the capacity, and updates run as vectorized
+    array operations on a fixed timestep, so a celebration costs the same per
+    frame no matter how many triggers fire.
+    """
+
+    def __init__(self, capacity: int = MAX_PARTICLES, colors: Sequence[Tuple[int, int, int]] = RAINBOW_COLORS):
+        self.capacity = capacity
+        self.position = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocity = np.zeros((capacity, 2), dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)  # Seconds left; <= 0 means the slot is free
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.color = np.zeros(capacity, dtype=np.int16)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self._accumulator = 0.0
+
+        # Sprite index = color * len(SPRITE_SIZES) + size bucket
+        self.sprites: List[pygame.Surface] = [
+            make_star_sprite(color, size) for color in colors for size in SPRITE_SIZES
+        ]
+        self._color_count = len(colors)
+        self._half_sizes = np.array([size // 2 for _ in colors for size in SPRITE_SIZES], dtype=np.int32)
+
+    @property
+    def live_count(self) -> int:
+        """Number of particles currently alive."""
+        return int(np.count_nonzero(self.life > 0))
+
+    def clear(self) -> None:
+        """Kill every particle, e.g. when a new session starts."""
+        self.life[:] = 0
+        self._accumulator = 0.0
+
+    def emit(self, x: float, y: float, count: int, speed: Tuple[float, float] = (80, 220),
+             life: Tuple[float, float] = (0.6, 1.2), gravity: float = GRAVITY,
+             spread: Tuple[float, float] = (0, 2 * math.pi)) -> int:
+        """Spawn up to count particles at (x, y) in free slots and return how many were spawned."""
+        free = np.flatnonzero(self.life <= 0)[:count]
+        n = len(free)
+        if n == 0:
+            return 0
+        angles = np.random.uniform(spread[0], spread[1], n)
+        speeds = np.random.uniform(speed[0], speed[1], n)
+        self.position[free] = (x, y)
+        self.velocity[free, 0] = np.cos(angles) * speeds
+        self.velocity[free, 1] = np.sin(angles) * speeds
+        lifetimes = np.random.uniform(life[0], life[1], n)
+        self.life[free] = lifetimes
+        self.max_life[free] = lifetimes
+        self.color[free] = np.random.randint(0, self._color_count, n)
+        self.gravity[free] = gravity
+        return n
+
+    def sparkle(self, x: float, y: float) -> None:
+        """Small rainbow sparkle for a correct answer."""
+        self.emit(x, y, 12, speed=(40, 120), life=(0.4, 0.8))
+
+    def rainbow_burst(self, x: float, y: float) -> None:
+        """Big rainbow sparkle fountain for a streak milestone."""
+        self.emit(x, y, 80, speed=(150, 320), life=(0.8, 1.4), spread=(math.pi * 1.1, math.pi * 1.9))
+
+    def star_burst(self, width: int, height: int) -> None:
+        """Star bursts across the screen for a level up."""
+        for i in range(4):
+            self.emit(width * (i + 1) / 5, height / 3, 50, speed=(100, 260), life=(1.0, 1.8), gravity=GRAVITY / 2)
+
+    def update(self, dt: float) -> None:
+        """Advance the simulation by dt seconds using fixed timesteps."""
+        self._accumulator = min(self._accumulator + dt, TIMESTEP * MAX_STEPS_PER_FRAME)
+        while self._accumulator >= TIMESTEP:
+            self._step(TIMESTEP)
+            self._accumulator -= TIMESTEP
+
+    def _step(self, step: float) -> None:
+        """Integrate every slot at once; dead slots are masked out by their lifetime."""
+        alive = self.life > 0
+        if not alive.any():
+            return
+        self.velocity[:, 1] += self.gravity * step
+        self.position += self.velocity * step
+        self.life -= step
+        self.life[~alive] = 0
+
+    def draw(self, surface: pygame.Surface) -> None:
+        """Blit every live particle with one blits() call."""
+        live = np.flatnonzero(self.life > 0)
+        if len(live) == 0:
+            return
+        # Particles shrink through the sprite sizes as they age
+        buckets = np.minimum((self.life[live] / self.max_life[live] * len(SPRITE_SIZES)).astype(np.int32),
+                             len(SPRITE_SIZES) - 1)
+        sprite_ids = self.color[live] * len(SPRITE_SIZES) + buckets
+        offsets = self._half_sizes[sprite_ids]
+        xs = (self.position[live, 0].astype(np.int32) - offsets).tolist()
+        ys = (self.position[live, 1].astype(np.int32) - offsets).tolist()
+        sprites = self.sprites
+        surface.blits([(sprites[i], (x, y)) for i, x, y in zip(sprite_ids.tolist(), xs, ys)], doreturn=False)
@@ -0,0 +1,87 @@
+import threading
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple
+
+PREFETCH_DEPTH = 3  # Ready items kept per key
+
+class ProblemPrefetcher:
+    """Keeps a few ready-made items (problems with their rendered text) per key, made on a worker thread.
+
+    The game watches the keys it can ask for next (the current level's
+    difficulties). The worker tops each watched queue up to PREFETCH_DEPTH.
+    pop() is a constant-time deque pop, and it returns None when the queue is
+    empty so the caller can fall back to making the item itself. Watching new
+    keys drops the other queues, and invalidate() drops everything, including
+    items still being made.
+    """
+
+    def __init__(self, produce: Callable[[Hashable], Any], depth: int = PREFETCH_DEPTH):
+        self._produce = produce
+        self.depth = depth
+        self._keys: Tuple[Hashable, ...] = ()
+        self._queues: Dict[Hashable, Deque[Any]] = {}
+        self._generation = 0  # Bumped by invalidate() so in-flight items are thrown away
+        self._closed = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="problem-prefetch", daemon=True)
+        self._thread.start()
+
+    def watch(self, keys: Tuple[Hashable, ...]) -> None:
+        """Prefetch for these keys only, dropping the queues of any others."""
+        if keys == self._keys:
+            return
+        with self._condition:
+            self._keys = keys
+            self._queues = {key: self._queues.get(key) or deque() for key in keys}
+            self._condition.notify()
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Take a ready item for key, or None if there isn't one yet."""
+        with self._condition:
+            queue = self._queues.get(key)
+            if not queue:
+                return None
+            item = queue.popleft()
+            self._condition.notify()  # Wake the worker to refill
+            return item
+
+    def invalidate(self) -> None:
+        """Drop every ready item, e.g. when the text they were made with is out of date."""
+        with self._condition:
+            self._generation += 1
+            for queue in self._queues.values():
+                queue.clear()
+            self._condition.notify()
+
+    def close(self) -> None:
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _next_key(self) -> Optional[Hashable]:
+        for key in self._keys:
+            if len(self._queues[key]) < self.depth:
+                return key
+        return None
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                key = self._next_key()
+                while key is None and not self._closed:
+                    self._condition.wait()
+                    key = self._next_key()
+                if self._closed:
+                    return
+                generation = self._generation
+            try:
+                item = self._produce(key)
+            except Exception as e:
+                # The game keeps working without prefetching
+                print(f"Problem prefetching stopped: {e}")
+                return
+            with self._condition:
+                queue = self._queues.get(key)
+                if generation == self._generation and queue is not None and len(queue) < self.depth:
+                    queue.append(item)
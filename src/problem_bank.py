@@ -0,0 +1,212 @@
+import argparse
+import json
+import os
+import random
+import time
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from levels import LEVELS
+from operations import DIFFICULTIES, OPERATIONS, Problem
+
+DEFAULT_BANK = os.path.join("data", "problem_bank.npy")
+MAX_OPERANDS = 4
+MAX_DENOMINATOR = 1000  # Exact answers are fractions; float answers are snapped to these
+CHUNK_SIZE = 100_000  # Records generated in memory before they are written out
+
+# One fixed-width record per problem. The question text is not stored: it is
+# rebuilt from the operands and template so it follows the active profile's names.
+RECORD = np.dtype([
+    ("level", "u1"),
+    ("operation", "u1"),  # Index into the bank's operation codes
+    ("template", "u1"),
+    ("difficulty", "u1"),
+    ("operand_count", "u1"),
+    ("operands", "<f8", (MAX_OPERANDS,)),
+    ("numerator", "<i4"),  # Exact answer
+    ("denominator", "<i4"),
+])
+
+def index_path(path: str) -> str:
+    """The JSON index stored next to a bank file."""
+    return os.path.splitext(path)[0] + ".json"
+
+def exact_answer(value) -> Fraction:
+    """Return an operation's answer as an exact fraction, checking nothing is lost."""
+    exact = Fraction(value).limit_denominator(MAX_DENOMINATOR)
+    if abs(float(exact) - value) > 1e-9:
+        raise ValueError(f"answer {value!r} is not a fraction with a denominator up to {MAX_DENOMINATOR}")
+    return exact
+
+def sample_record(level: int, code_index: Dict[str, int]) -> tuple:
+    """Draw one problem for a level, as a RECORD row."""
+    level_info = LEVELS[level]
+    code, operands, template = OPERATIONS[random.choice(level_info["operations"])].sample(level_info["range"])
+    operation = OPERATIONS[code]
+    answer = exact_answer(operation.module.answer(operands))
+    padded = tuple(operands) + (0,) * (MAX_OPERANDS - len(operands))
+    return (level, code_index[code], template, operation.difficulty(operands), len(operands),
+            padded, answer.numerator, answer.denominator)
+
+def build_bank(path: str = DEFAULT_BANK, count: int = 1_000_000, seed: Optional[int] = None) -> None:
+    """Write count problems, spread evenly over the levels, to a bank file and its index.
+
+    Records are grouped by level and sorted by difficulty within each level,
+    so every (level, difficulty) pair is one contiguous slice.
+    """
+    random.seed(seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    codes = list(OPERATIONS)
+    code_index = {code: i for i, code in enumerate(codes)}
+    levels = sorted(LEVELS)
+
+    tmp_path = path + ".tmp"
+    bank = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=RECORD, shape=(count,))
+    level_spans = {}
+    difficulty_spans = {}
+    start = 0
+    for i, level in enumerate(levels):
+        level_count = count // len(levels) + (i < count % len(levels))
+        records = np.empty(level_count, RECORD)
+        for chunk_start in range(0, level_count, CHUNK_SIZE):
+            chunk_end = min(chunk_start + CHUNK_SIZE, level_count)
+            records[chunk_start:chunk_end] = np.array(
+                [sample_record(level, code_index) for _ in range(chunk_end - chunk_start)], RECORD)
+        records = records[np.argsort(records["difficulty"], kind="stable")]
+        bank[start:start + level_count] = records
+
+        level_spans[str(level)] = [start, start + level_count]
+        bounds = np.searchsorted(records["difficulty"], DIFFICULTIES + (max(DIFFICULTIES) + 1,))
+        difficulty_spans[str(level)] = {str(difficulty): [start + int(bounds[j]), start + int(bounds[j + 1])]
+                                        for j, difficulty in enumerate(DIFFICULTIES)}
+        start += level_count
+    bank.flush()
+    del bank
+
+    index = {
+        "count": count,
+        "seed": seed,
+        "operations": codes,
+        # Template counts when built; a bank is stale once they change
+        "templates": {code: len(OPERATIONS[code].templates) for code in codes},
+        "levels": level_spans,
+        "difficulties": difficulty_spans,
+    }
+    with open(index_path(tmp_path), "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, path)
+    os.replace(index_path(tmp_path), index_path(path))
+
+class ProblemBank:
+    """A read-only, memory-mapped bank of pre-generated, difficulty-graded problems.
+
+    The records are mapped with mmap_mode="r", so every game or grading process
+    on a machine shares the operating system's cached pages instead of holding
+    its own copy. The index gives each level and (level, difficulty) pair as a
+    contiguous slice. Sampling is a random offset into a slice: O(1) however
+    large the bank is.
+    """
+
+    def __init__(self, path: str):
+        with open(index_path(path), "r") as f:
+            index = json.load(f)
+        self.path = path
+        self.records = np.load(path, mmap_mode="r")
+        if self.records.dtype != RECORD or len(self.records) != index["count"]:
+            raise ValueError(f"{path} does not match its index; rebuild the problem bank")
+        self.operations: List[str] = index["operations"]
+        for code, template_count in index["templates"].items():
+            if code not in OPERATIONS or len(OPERATIONS[code].templates) != template_count:
+                raise ValueError(f"problem types changed since {path} was built; rebuild the problem bank")
+        self.level_spans: Dict[int, Tuple[int, int]] = {
+            int(level): tuple(span) for level, span in index["levels"].items()
+        }
+        self.difficulty_spans: Dict[Tuple[int, int], Tuple[int, int]] = {
+            (int(level), int(difficulty)): tuple(span)
+            for level, spans in index["difficulties"].items() for difficulty, span in spans.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def sample_index(self, level: int, difficulty: Optional[int] = None) -> Optional[int]:
+        """Return a random record index for a level (and difficulty, if the bank has any of it)."""
+        start, end = self.difficulty_spans.get((level, difficulty), (0, 0))
+        if end <= start:
+            start, end = self.level_spans.get(level, (0, 0))
+            if end <= start:
+                return None
+        return random.randrange(start, end)
+
+    def operands(self, index: int) -> tuple:
+        record = self.records[index]
+        # Stored as floats; whole numbers go back to ints so templates format them as before
+        return tuple(int(x) if x.is_integer() else float(x) for x in record["operands"][:record["operand_count"]])
+
+    def problem(self, index: int) -> Problem:
+        """Build the problem stored at an index."""
+        record = self.records[index]
+        return OPERATIONS[self.operations[record["operation"]]].build(self.operands(index), int(record["template"]))
+
+    def exact_answer(self, index: int) -> Fraction:
+        record = self.records[index]
+        return Fraction(int(record["numerator"]), int(record["denominator"]))
+
+    def difficulty(self, index: int) -> int:
+        return int(self.records[index]["difficulty"])
+
+    def sample(self, level: int, difficulty: Optional[int] = None) -> Optional[Problem]:
+        """Return a random problem for a level, or None if the bank has none for it."""
+        index = self.sample_index(level, difficulty)
+        return None if index is None else self.problem(index)
+
+def open_bank(path: str) -> Optional[ProblemBank]:
+    """Open a bank if one has been built, otherwise return None."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return ProblemBank(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Couldn't open problem bank {path}: {e}")
+        return None
+
+def main():
+    """Build or inspect a bank: python src/problem_bank.py build --count 2000000"""
+    parser = argparse.ArgumentParser(description="Unicorn Math Adventures problem bank")
+    parser.add_argument("--bank", default=DEFAULT_BANK, help="Path to the bank's .npy file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build = subparsers.add_parser("build", help="Generate a new bank")
+    build.add_argument("--count", type=int, default=1_000_000)
+    build.add_argument("--seed", type=int, default=None)
+    subparsers.add_parser("stats", help="Show how many problems there are per level and difficulty")
+    sample = subparsers.add_parser("sample", help="Print random problems with their exact answers")
+    sample.add_argument("level", type=int)
+    sample.add_argument("--difficulty", type=int, choices=DIFFICULTIES, default=None)
+    sample.add_argument("-n", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        build_bank(args.bank, args.count, args.seed)
+        size = os.path.getsize(args.bank)
+        print(f"Wrote {args.count:,} problems to {args.bank} ({size / 2**20:.1f} MiB) "
+              f"in {time.perf_counter() - start:.1f}s")
+        return
+
+    bank = ProblemBank(args.bank)
+    if args.command == "stats":
+        for (level, difficulty), (start, end) in sorted(bank.difficulty_spans.items()):
+            print(f"Level {level}, difficulty {difficulty}: {end - start:,} problems")
+    else:
+        for _ in range(args.n):
+            index = bank.sample_index(args.level, args.difficulty)
+            if index is None:
+                print(f"No problems for level {args.level}")
+                break
+            problem = bank.problem(index)
+            print(f"[{bank.difficulty(index)}] {problem.question} = {bank.exact_answer(index)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+import argparse
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS players (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    current_level INTEGER NOT NULL DEFAULT 1,
+    created TEXT NOT NULL,
+    last_played TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_players_last_played ON players(last_played);
+
+CREATE TABLE IF NOT EXISTS level_bests (
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    level INTEGER NOT NULL,
+    best_streak INTEGER NOT NULL,
+    PRIMARY KEY (player_id, level)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS operation_totals (
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    operation TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    correct INTEGER NOT NULL,
+    misses INTEGER NOT NULL,
+    miss_rate REAL NOT NULL,
+    PRIMARY KEY (player_id, operation)
+) WITHOUT ROWID;
+-- Answers "who is stuck on <operation>" with an index range scan
+CREATE INDEX IF NOT EXISTS idx_operation_totals_stuck ON operation_totals(operation, miss_rate);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    player_id INTEGER NOT NULL REFERENCES players(id) ON DELETE CASCADE,
+    started TEXT NOT NULL,
+    ended TEXT NOT NULL,
+    start_level INTEGER NOT NULL,
+    end_level INTEGER NOT NULL,
+    score INTEGER NOT NULL,
+    max_streak INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_player ON sessions(player_id, started);
+"""
+
+# Friendly names for the operation codes used by the game
+OPERATION_NAMES = {
+    "addition": "+",
+    "subtraction": "-",
+    "multiplication": "*",
+    "division": "/",
+    "multi-step": "multi",
+    "fractions": "frac",
+    "decimals": "dec",
+    "place-value": "place",
+    "exponents": "exp",
+    "multi-step-division": "longdiv",
+}
+
+class Profile(NamedTuple):
+    """A player's saved progress."""
+    name: str
+    current_level: int
+    best_streaks: Dict[int, int]
+
+class StuckPlayer(NamedTuple):
+    """A row of the "who is stuck" report."""
+    name: str
+    attempts: int
+    correct: int
+    misses: int
+    miss_rate: float
+
+def now_text() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+class ProfileStore:
+    """SQLite-backed player profiles: level, best streaks, per-operation totals and session history.
+
+    Every lookup the game and teacher tools make is served by a primary key or
+    an index, so they stay fast with hundreds of profiles and long histories.
+    Gameplay totals are written once per session in a single transaction.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _player_id(self, name: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM players WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def create_player(self, name: str, level: int = 1) -> Profile:
+        """Create a profile (or return the existing one with that name)."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO players (name, current_level, created, last_played) VALUES (?, ?, ?, ?)",
+                (name, level, now_text(), now_text()),
+            )
+        return self.get_player(name)
+
+    def get_player(self, name: str) -> Optional[Profile]:
+        row = self.conn.execute("SELECT id, name, current_level FROM players WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return None
+        bests = dict(self.conn.execute("SELECT level, best_streak FROM level_bests WHERE player_id = ?", (row[0],)))
+        return Profile(row[1], row[2], bests)
+
+    def recent_players(self, limit: int = 6) -> List[Tuple[str, int]]:
+        """Return (name, current_level) for the most recently played profiles."""
+        return self.conn.execute(
+            "SELECT name, current_level FROM players ORDER BY last_played DESC LIMIT ?", (limit,)
+        ).fetchall()
+
+    def touch_player(self, name: str) -> None:
+        """Mark a profile as the most recently played one."""
+        with self.conn:
+            self.conn.execute("UPDATE players SET last_played = ? WHERE name = ?", (now_text(), name))
+
+    def record_session(self, name: str, started: str, start_level: int, end_level: int, score: int,
+                       max_streak: int, level_bests: Dict[int, int],
+                       operation_totals: Dict[str, List[int]]) -> None:
+        """Save a finished session and fold its totals into the profile.
+
+        operation_totals maps an operation to [attempts, correct, misses].
+        """
+        player_id = self._player_id(name)
+        if player_id is None:
+            self.create_player(name, start_level)
+            player_id = self._player_id(name)
+        ended = now_text()
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO sessions (player_id, started, ended, start_level, end_level, score, max_streak) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (player_id, started, ended, start_level, end_level, score, max_streak),
+            )
+            self.conn.execute("UPDATE players SET current_level = ?, last_played = ? WHERE id = ?",
+                              (end_level, ended, player_id))
+            self.conn.executemany(
+                "INSERT INTO level_bests (player_id, level, best_streak) VALUES (?, ?, ?) "
+                "ON CONFLICT (player_id, level) DO UPDATE SET best_streak = MAX(best_streak, excluded.best_streak)",
+                [(player_id, level, best) for level, best in level_bests.items()],
+            )
+            self.conn.executemany(
+                "INSERT INTO operation_totals (player_id, operation, attempts, correct, misses, miss_rate) "
+                "VALUES (?, ?, ?, ?, ?, 0) "
+                "ON CONFLICT (player_id, operation) DO UPDATE SET "
+                "attempts = attempts + excluded.attempts, correct = correct + excluded.correct, "
+                "misses = misses + excluded.misses",
+                [(player_id, op, *totals) for op, totals in operation_totals.items()],
+            )
+            self.conn.executemany(
+                "UPDATE operation_totals SET miss_rate = 1.0 - CAST(correct AS REAL) / attempts "
+                "WHERE player_id = ? AND operation = ? AND attempts > 0",
+                [(player_id, op) for op in operation_totals],
+            )
+
+    def stuck_players(self, operation: str, min_miss_rate: float = 0.5, min_attempts: int = 10,
+                      limit: int = 20) -> List[StuckPlayer]:
+        """Players whose share of wrong answers for an operation is at least min_miss_rate, worst first."""
+        operation = OPERATION_NAMES.get(operation, operation)
+        rows = self.conn.execute(
+            "SELECT p.name, t.attempts, t.correct, t.misses, t.miss_rate "
+            "FROM operation_totals t JOIN players p ON p.id = t.player_id "
+            "WHERE t.operation = ? AND t.miss_rate >= ? AND t.attempts >= ? "
+            "ORDER BY t.miss_rate DESC LIMIT ?",
+            (operation, min_miss_rate, min_attempts, limit),
+        )
+        return [StuckPlayer(*row) for row in rows]
+
+def main():
+    """Teacher report: python src/profiles.py stuck division"""
+    default_path = os.path.join(os.path.expanduser("~"), "Documents", "Unicorn Math Adventures", "profiles.db")
+    parser = argparse.ArgumentParser(description="Unicorn Math Adventures player reports")
+    parser.add_argument("--db", default=default_path, help="Path to profiles.db")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stuck = subparsers.add_parser("stuck", help="List players who are stuck on an operation")
+    stuck.add_argument("operation", help=f"One of: {', '.join(OPERATION_NAMES)} (or an operation code)")
+    stuck.add_argument("--min-miss-rate", type=float, default=0.5)
+    stuck.add_argument("--min-attempts", type=int, default=10)
+    stuck.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    store = ProfileStore(args.db)
+    rows = store.stuck_players(args.operation, args.min_miss_rate, args.min_attempts, args.limit)
+    if not rows:
+        print("Nobody is stuck. Great job, everyone!")
+    for row in rows:
+        print(f"{row.name}: {row.miss_rate:.0%} wrong ({row.attempts - row.correct}/{row.attempts} answers, "
+              f"{row.misses} problems missed)")
+    store.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+import heapq
+import itertools
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+# SM-2 style scheduling, with short first steps so a missed fact comes back
+# later in the same 5 minute session before moving out to days
+RELEARN_INTERVAL = 60  # Seconds until a missed problem is due again
+FIRST_INTERVAL = 10 * 60  # After the first successful review
+SECOND_INTERVAL = 24 * 60 * 60  # After the second successful review
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+PASSING_QUALITY = 3  # Grades below this (0-5 scale) count as a miss
+
+class ReviewItem:
+    """A missed problem and its spaced-repetition schedule."""
+    __slots__ = ("operation", "operands", "answer", "level", "due", "ease", "interval", "reps", "seq")
+
+    def __init__(self, operation: str, operands: tuple, answer, level: int):
+        self.operation = operation
+        self.operands = operands
+        self.answer = answer
+        self.level = level
+        self.due = 0.0
+        self.ease = DEFAULT_EASE
+        self.interval = 0.0
+        self.reps = 0
+        self.seq = 0  # Matches the item's live heap entry; older entries are stale
+
+    @property
+    def key(self) -> Tuple[str, tuple]:
+        return self.operation, self.operands
+
+    def schedule(self, quality: int, now: float) -> None:
+        """Update ease and interval from a 0-5 grade, SM-2 style."""
+        if quality < PASSING_QUALITY:
+            self.reps = 0
+            self.interval = RELEARN_INTERVAL
+        else:
+            self.reps += 1
+            if self.reps == 1:
+                self.interval = FIRST_INTERVAL
+            elif self.reps == 2:
+                self.interval = SECOND_INTERVAL
+            else:
+                self.interval *= self.ease
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        self.due = now + self.interval
+
+    def to_record(self) -> dict:
+        return {
+            "operation": self.operation,
+            "operands": list(self.operands),
+            "answer": self.answer,
+            "level": self.level,
+            "due": self.due,
+            "ease": self.ease,
+            "interval": self.interval,
+            "reps": self.reps,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict) -> "ReviewItem":
+        item = cls(record["operation"], tuple(record["operands"]), record["answer"], record["level"])
+        item.due = record["due"]
+        item.ease = record["ease"]
+        item.interval = record["interval"]
+        item.reps = record["reps"]
+        return item
+
+class ReviewScheduler:
+    """Per-player queue of missed problems ordered by due time.
+
+    Items live in one min-heap per level, keyed by due time. Rescheduling
+    pushes a fresh heap entry and leaves the old one to be skipped lazily, so
+    grading and picking the next due item are O(log n). Every change is
+    appended to a JSON-lines journal (O(1) per write); the journal is replayed
+    and compacted when the scheduler is opened.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._items: Dict[Tuple[str, tuple], ReviewItem] = {}
+        self._heaps: Dict[int, List[Tuple[float, int, Tuple[str, tuple]]]] = {}
+        self._counter = itertools.count(1)
+        self._journal = None
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _load(self) -> None:
+        """Replay the journal (latest record per problem wins) and rebuild the heaps."""
+        lines = 0
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        item = ReviewItem.from_record(json.loads(line))
+                    except (ValueError, KeyError, TypeError):
+                        continue  # Skip a torn last line from a crash
+                    self._items[item.key] = item
+        for item in self._items.values():
+            item.seq = next(self._counter)
+            self._heaps.setdefault(item.level, []).append((item.due, item.seq, item.key))
+        for heap in self._heaps.values():
+            heapq.heapify(heap)
+        if lines > 2 * len(self._items) + 100:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Rewrite the journal with one record per item, atomically."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for item in self._items.values():
+                f.write(json.dumps(item.to_record()) + "\n")
+        os.replace(tmp_path, self.path)
+
+    def _append(self, item: ReviewItem) -> None:
+        if self._journal is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._journal = open(self.path, "a", encoding="utf-8")
+        self._journal.write(json.dumps(item.to_record()) + "\n")
+        self._journal.flush()
+
+    def _push(self, item: ReviewItem) -> None:
+        item.seq = next(self._counter)
+        heap = self._heaps.setdefault(item.level, [])
+        heapq.heappush(heap, (item.due, item.seq, item.key))
+        # Drop stale entries once they outnumber live ones (amortized O(1))
+        if len(heap) > 64 and len(heap) > 2 * len(self._items):
+            self._heaps[item.level] = heap = [entry for entry in heap if self._is_live(entry)]
+            heapq.heapify(heap)
+
+    def _is_live(self, entry: Tuple[float, int, Tuple[str, tuple]]) -> bool:
+        item = self._items.get(entry[2])
+        return item is not None and item.seq == entry[1]
+
+    def grade(self, operation: str, operands: tuple, answer, level: int, quality: int,
+              now: Optional[float] = None) -> None:
+        """Record how a problem went (0-5). Misses start tracking it; passes only update tracked items."""
+        key = (operation, tuple(operands))
+        item = self._items.get(key)
+        if item is None:
+            if quality >= PASSING_QUALITY:
+                return
+            item = self._items[key] = ReviewItem(operation, key[1], answer, level)
+        item.schedule(quality, time.time() if now is None else now)
+        self._push(item)
+        self._append(item)
+
+    def next_due(self, max_level: int, now: Optional[float] = None) -> Optional[ReviewItem]:
+        """Return the most overdue item at or below max_level, or None. The item stays queued until graded."""
+        now = time.time() if now is None else now
+        best = None
+        for level, heap in self._heaps.items():
+            if level > max_level:
+                continue
+            while heap and not self._is_live(heap[0]):
+                heapq.heappop(heap)
+            if heap and heap[0][0] <= now and (best is None or heap[0] < best):
+                best = heap[0]
+        return self._items[best[2]] if best else None
+
+    def close(self) -> None:
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
@@ -2,10 +2,23 @@ import pygame
 import random
 import sys
 import os
-from typing import Tuple, Dict, List
+from typing import NamedTuple, Tuple, Dict, List, Optional
 from datetime import datetime
 import json
 
+from family import FAMILY
+from levels import LEVELS
+from operations import DIFFICULTIES, OPERATIONS, Problem, check_answer, type_char
+from particles import ParticleSystem
+from prefetch import ProblemPrefetcher
+from problem_bank import open_bank
+from profiles import ProfileStore
+from alloc_profiler import AllocationProfiler
+from checkpoint import Checkpoint, SessionCheckpointer, load_checkpoint
+from game_state import GameState
+from review_scheduler import ReviewScheduler
+from widgets import Button, Label, ProgressBar, TextInput, WidgetGroup
+
 # Initialize Pygame and its mixer for sound
 pygame.init()
 pygame.mixer.init()
@@ -26,6 +39,9 @@ os.makedirs(APP_PATH, exist_ok=True)
 
 # File paths
 HIGH_SCORES_FILE = os.path.join(APP_PATH, "high_scores.json")
+PROFILES_FILE = os.path.join(APP_PATH, "profiles.db")
+PROBLEM_BANK_FILE = get_resource_path("data/problem_bank.npy")
+CHECKPOINT_FILE = os.path.join(APP_PATH, "session.jsonl")
 UNICORN_IMAGE = get_resource_path("assets/images/unicorn.png")
 RAINBOW_IMAGE = get_resource_path("assets/images/rainbow.png")
 CORRECT_SOUND = get_resource_path("assets/sounds/success-1-6297.mp3")
@@ -34,9 +50,17 @@ ERROR_SOUND = get_resource_path("assets/sounds/error-call-to-attention-129258.mp
 # Ensure data directory exists
 os.makedirs("data", exist_ok=True)
 
-# Screen dimensions
+# Logical screen dimensions; all drawing uses these coordinates whatever the window size
 WIDTH, HEIGHT = 800, 600
 
+# The window is resizable and can go fullscreen (F11 or --fullscreen). SCALED lets
+# SDL's renderer scale the logical frame to the window, so frame cost is the same
+# on an 800x600 laptop and a 4K classroom display.
+DISPLAY_FLAGS = pygame.SCALED | pygame.RESIZABLE
+if "--fullscreen" in sys.argv:
+    DISPLAY_FLAGS |= pygame.FULLSCREEN
+os.environ.setdefault("SDL_RENDER_SCALE_QUALITY", "1")  # Smooth (linear) upscaling of text and sprites
+
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -50,15 +74,20 @@ TITLE_FONT = pygame.font.Font(None, 60)
 SMALL_FONT = pygame.font.Font(None, 30)  # Smaller font for streak counters
 
 # Initialize screen
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+screen = pygame.display.set_mode((WIDTH, HEIGHT), DISPLAY_FLAGS)
 pygame.display.set_caption("Ella's Unicorn Math Adventures")
 
+def load_image(path: str, size: Tuple[int, int]) -> pygame.Surface:
+    """Load an image at the given size, preferring the pre-sized PNG from image_converter.py."""
+    sized_path = f"{os.path.splitext(path)[0]}_{size[0]}.png"
+    if os.path.exists(sized_path):
+        return pygame.image.load(sized_path).convert()
+    return pygame.transform.scale(pygame.image.load(path), size).convert()
+
 # Load assets
 try:
-    unicorn_image = pygame.image.load(UNICORN_IMAGE)
-    unicorn_image = pygame.transform.scale(unicorn_image, (150, 150))
-    reward_image = pygame.image.load(RAINBOW_IMAGE)
-    reward_image = pygame.transform.scale(reward_image, (100, 100))
+    unicorn_image = load_image(UNICORN_IMAGE, (150, 150))
+    reward_image = load_image(RAINBOW_IMAGE, (100, 100))
 except pygame.error as e:
     print(f"Couldn't load images: {e}")
     print("Make sure to run image_converter.py first to convert webp images to png")
@@ -88,14 +117,91 @@ except Exception as e:
 
 # Clock
 clock = pygame.time.Clock()
+SESSION_SECONDS = 300  # Length of a game
+
+# Unfinished session saved in the background, offered for resuming after a crash
+session_checkpointer = SessionCheckpointer(CHECKPOINT_FILE)
+
+# Spaced-repetition review queues for missed problems, one per player
+REVIEWS_PATH = os.path.join(APP_PATH, "reviews")
+REVIEW_SPACING = 2  # New problems asked between two reviews
+review_schedulers: Dict[str, ReviewScheduler] = {}
+
+# Player profiles (level, best streaks, per-operation totals, session history)
+profile_store = ProfileStore(PROFILES_FILE)
+
+# Pre-generated, difficulty-graded problems (optional; build with problem_bank.py)
+problem_bank = open_bank(PROBLEM_BANK_FILE)
+
+# Per-frame allocation and GC pause reports (--profile-allocations or UNICORN_PROFILE_ALLOCATIONS=1)
+allocation_profiler = AllocationProfiler.from_args(sys.argv)
+
+# Celebration particles (sparkles and star bursts), pooled for a fixed frame cost
+particles = ParticleSystem()
 
-# Family names for personalized messages
-FAMILY = {
-    "player": "Ella",
-    "sister": "Mila",
-    "dad": "Dad",
-    "mom": "Mom"
-}
+# Focus-aware runtime: while the window is minimized, hidden or in the background,
+# nothing is drawn, sounds are paused and the game clock stands still
+PAUSE_EVENTS = (pygame.WINDOWFOCUSLOST, pygame.WINDOWMINIMIZED, pygame.WINDOWHIDDEN)
+RESUME_EVENTS = (pygame.WINDOWFOCUSGAINED, pygame.WINDOWRESTORED, pygame.WINDOWSHOWN)
+paused_ms = 0  # Total time spent paused, left out of game_ticks()
+
+def game_ticks() -> int:
+    """Milliseconds since start, not counting time spent paused in the background."""
+    return pygame.time.get_ticks() - paused_ms
+
+def draw_paused_overlay() -> None:
+    """Dim the last frame and say the game is paused (shown while the window is visible but unfocused)."""
+    overlay = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+    overlay.fill((255, 255, 255, 150))
+    text_surface = TITLE_FONT.render("Paused", True, PURPLE)
+    overlay.blit(text_surface, text_surface.get_rect(center=(WIDTH//2, HEIGHT//2)))
+    screen.blit(overlay, (0, 0))
+    pygame.display.flip()
+
+def wait_until_active(visible: bool) -> bool:
+    """Sleep until the window is back in front. Returns False if it was closed meanwhile."""
+    global paused_ms
+    paused_at = pygame.time.get_ticks()
+    pygame.mixer.pause()
+    if visible:
+        draw_paused_overlay()
+    try:
+        # Blocking wait: no frames, no timer ticks, next to no CPU until an event arrives
+        while True:
+            event = pygame.event.wait()
+            if event.type == pygame.QUIT:
+                return False
+            if event.type in RESUME_EVENTS:
+                return True
+    finally:
+        pygame.mixer.unpause()
+        paused_ms += pygame.time.get_ticks() - paused_at
+
+def get_events() -> List[pygame.event.Event]:
+    """Return pending events after handling window-level ones.
+
+    F11 toggles fullscreen, and losing focus or visibility pauses the game
+    until the window is active again.
+    """
+    events = []
+    # Window events often come in bursts (e.g. hidden then shown again while the
+    # display is set up), so only the state after the whole batch counts
+    active, visible = True, True
+    for event in pygame.event.get():
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+            pygame.display.toggle_fullscreen()
+            continue
+        if event.type in PAUSE_EVENTS:
+            active = False
+            visible = visible and event.type == pygame.WINDOWFOCUSLOST
+            continue
+        if event.type in RESUME_EVENTS:
+            active, visible = True, True
+            continue
+        events.append(event)
+    if not active and not wait_until_active(visible):
+        events.append(pygame.event.Event(pygame.QUIT))
+    return events
 
 def load_high_scores() -> list:
     """Load high scores from file."""
@@ -121,13 +227,21 @@ def save_high_score(score: int, player_name: str) -> None:
     with open(HIGH_SCORES_FILE, 'w') as f:
         json.dump(scores, f)
 
+def high_score_rows(scores: list) -> tuple:
+    """Flatten high score entries into hashable (player, score, date) rows."""
+    return tuple((entry['player'], entry['score'], entry.get('date', 'N/A')) for entry in scores)
+
 def show_game_over(score: int, max_streak: int) -> bool:
     """Show game over screen with final score and high scores."""
-    high_scores = load_high_scores()
-    player_name = ""  # Start with empty name field
-    name_input_active = True
+    name_input = TextInput(NAME_INPUT_RECT, FONT, FAMILY["player"], active=True)  # Start with the active profile's name
+    save_button = Button(NAME_INPUT_RECT, "Save Score", FONT)  # Placed below the scores by show_high_scores()
+    play_again = Button(NAME_INPUT_RECT, "Play Again", FONT)
+    score_labels = layout_high_score_labels()
+    message_label = Label((0, HEIGHT - 160, WIDTH, 40), FONT, color=PURPLE, align="center")
+    widgets = WidgetGroup([name_input, *(label for row in score_labels for label in row),
+                           save_button, play_again, message_label])
+    show_high_scores(high_score_rows(load_high_scores()), score_labels, save_button, play_again)
     score_saved = False  # Track if score has been saved
-    message = ""  # For displaying save status messages
     message_timer = 0
     
     # Clear screen and events before showing game over screen
@@ -138,77 +252,39 @@ def show_game_over(score: int, max_streak: int) -> bool:
     
     running = True
     while running:
-        screen.fill(PINK)
-        current_time = pygame.time.get_ticks()
-        
-        # Draw game over message
-        title = "Time's Up!"
-        title_surface = TITLE_FONT.render(title, True, PURPLE)
-        screen.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 50))
-        
-        # Draw final score and streak
-        draw_text(f"Final Score: {score}", WIDTH//2 - 150, 120)
-        draw_text(f"Best Streak: {max_streak} ⭐", WIDTH//2 - 150, 160)
-        
-        # Draw name input field
-        draw_text("Enter Your Name:", WIDTH//2 - 150, 220)
-        pygame.draw.rect(screen, WHITE if name_input_active else BLACK, 
-                        (WIDTH//2 - 150, 260, 300, 50), 2)
-        draw_text(player_name, WIDTH//2 - 140, 270)
-        
-        # Draw high scores with dates
-        high_score_start_y = 340
-        draw_text("High Scores:", WIDTH//2 - 150, high_score_start_y)
-        
-        # Calculate button position based on number of high scores
-        line_height = 35
-        last_line_y = high_score_start_y + 40  # Default if no scores
-        
-        for i, score_data in enumerate(high_scores):
-            line_y = high_score_start_y + 40 + i * line_height
-            score_text = f"{score_data['player']}: {score_data['score']}"
-            date_text = f"({score_data.get('date', 'N/A')})"
-            draw_text(score_text, WIDTH//2 - 150, line_y, font=SMALL_FONT)
-            draw_text(date_text, WIDTH//2 + 100, line_y, font=SMALL_FONT)
-            last_line_y = line_y
-        
-        # Draw save and play again buttons below the last score
-        button_y = min(last_line_y + 60, HEIGHT - 80)  # Ensure buttons don't go off screen
-        save_text = "Score Saved!" if score_saved else "Save Score"
-        save_button = draw_button(save_text, WIDTH//2 - 220, button_y, 200, 50, selected=score_saved)
-        play_again = draw_button("Play Again", WIDTH//2 + 20, button_y, 200, 50)
-        
-        # Draw message if timer is active
-        if current_time < message_timer:
-            message_surface = FONT.render(message, True, PURPLE)
-            screen.blit(message_surface, (WIDTH//2 - message_surface.get_width()//2, HEIGHT - 160))
+        current_time = game_ticks()
         
+        # Only widgets that changed since the last frame are redrawn
+        message_label.set_visible(current_time < message_timer)
+        widgets.draw(screen, GAME_OVER_LAYER.get(score, max_streak))
         pygame.display.flip()
         
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 return False
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                clicked = widgets.widget_at(event.pos)
                 # Check if clicked on name input field
-                name_input_rect = pygame.Rect(WIDTH//2 - 150, 260, 300, 50)
-                name_input_active = name_input_rect.collidepoint(event.pos)
+                name_input.set_active(clicked is name_input)
                 
                 # Check button clicks
-                if save_button.collidepoint(event.pos) and not score_saved:
+                if clicked is save_button and not score_saved:
                     # Only save if name is not empty
-                    if player_name.strip():
-                        save_high_score(score, player_name)
+                    if name_input.text.strip():
+                        save_high_score(score, name_input.text)
                         score_saved = True
-                        name_input_active = False
-                        message = "Score saved!"
+                        name_input.set_active(False)
+                        save_button.set_text("Score Saved!")
+                        save_button.set_selected(True)
+                        message_label.set("Score saved!")
                         message_timer = current_time + 2000
                         # Reload high scores to show updated list
-                        high_scores = load_high_scores()
+                        show_high_scores(high_score_rows(load_high_scores()), score_labels, save_button, play_again)
                     else:
                         # Show message to enter name
-                        message = "Please enter your name"
+                        message_label.set("Please enter your name")
                         message_timer = current_time + 2000
-                elif play_again.collidepoint(event.pos):
+                elif clicked is play_again:
                     # Clear screen and events before returning
                     screen.fill(PINK)
                     pygame.display.flip()
@@ -216,403 +292,511 @@ def show_game_over(score: int, max_streak: int) -> bool:
                     pygame.time.wait(100)  # Brief pause
                     running = False
                     return True  # Signal to restart game directly
-            elif event.type == pygame.KEYDOWN and name_input_active:
-                if event.key == pygame.K_RETURN:
-                    name_input_active = False
-                elif event.key == pygame.K_BACKSPACE:
-                    player_name = player_name[:-1]
-                elif len(player_name) < 15 and event.unicode.isprintable():
-                    player_name += event.unicode
+            elif event.type == pygame.KEYDOWN and name_input.active:
+                if name_input.handle_key(event):
+                    name_input.set_active(False)
         
+        if allocation_profiler:
+            allocation_profiler.frame("show_game_over")
         clock.tick(30)
     return False  # Return False if loop exits without clicking Play Again
 
-def generate_word_problem(num1: int, num2: int, operation: str) -> str:
-    """Generate a word problem based on the numbers and operation."""
-    templates = {
-        "+": [
-            f"A unicorn collected {num1} rainbows in the morning and {num2} rainbows in the afternoon. How many rainbows did the unicorn collect in total?",
-            f"{FAMILY['player']} saw {num1} stars on a rainbow cloud, then {num2} more stars appeared. How many stars are there now?",
-            f"{FAMILY['sister']}'s dog buried {num1} bones in the yard and found {num2} more. How many bones does the dog have now?",
-            f"A magical garden grew {num1} sparkly flowers yesterday and {num2} more today. How many sparkly flowers are there now?",
-            f"{FAMILY['player']} found {num1} glitter pens in her backpack and {num2} more in her desk. How many glitter pens does she have in total?",
-            f"The unicorn school has {num1} students in the morning class and {num2} in the afternoon class. How many students are there altogether?"
-        ],
-        "-": [
-            f"{FAMILY['player']} has {num1} magical cupcakes and shares {num2} with {FAMILY['sister']}. How many cupcakes does {FAMILY['player']} have left?",
-            f"There are {num1} unicorns at a party, but {num2} unicorns had to leave early. How many unicorns are still at the party?",
-            f"A rainbow trail is {num1} feet long. If {num2} feet are covered by clouds, how many feet can you still see?",
-            f"A fairy has {num1} magic wands but {num2} of them lost their sparkle. How many sparkly wands are left?",
-            f"{FAMILY['player']} collected {num1} seashells at the beach, but gave {num2} to her friend. How many seashells does she have now?",
-            f"There were {num1} butterflies in the garden, but {num2} flew away. How many butterflies are still there?"
-        ],
-        "*": [
-            f"There are {num1} unicorns at a party, and each unicorn brings {num2} magical cupcakes. How many cupcakes are there in total?",
-            f"{FAMILY['player']} buys {num1} packs of dog treats with {num2} treats in each pack. How many treats does she have in total?",
-            f"If each rainbow has {num2} stars and you see {num1} rainbows, how many stars are there in total?",
-            f"Each fairy has {num2} magic crystals and there are {num1} fairies. How many magic crystals are there altogether?",
-            f"If each unicorn can grant {num2} wishes per day and there are {num1} unicorns, how many wishes can be granted in total?",
-            f"{FAMILY['player']} plants {num1} rows of magical flowers with {num2} flowers in each row. How many flowers did she plant in total?"
-        ],
-        "/": [
-            f"A rainbow trail is {num1} feet long. If {num2} unicorns each paint an equal length, how many feet does each unicorn paint?",
-            f"{FAMILY['player']} has {num1} sparkly stickers to share equally among {num2} friends. How many stickers does each friend get?",
-            f"Mom baked {num1} rainbow cookies to pack equally into {num2} gift boxes. How many cookies go in each box?",
-            f"A group of {num2} fairies needs to share {num1} magic crystals equally. How many crystals does each fairy get?",
-            f"There are {num1} glitter crayons to be shared among {num2} art stations. How many crayons should go to each station?",
-            f"If {num1} magical butterflies need to visit {num2} flower gardens equally, how many butterflies will visit each garden?"
-        ]
-    }
-    return random.choice(templates[operation])
-
-# Levels and problems
-LEVELS: Dict[int, Dict] = {
-    1: {
-        "operations": ["+", "-"],
-        "range": (1, 20),
-        "description": "Addition & Subtraction",
-        "encouragement": [
-            f"Great job, {FAMILY['player']}!",
-            f"{FAMILY['sister']} would be proud!",
-            f"Mom and Dad are amazed!"
-        ]
-    },
-    2: {
-        "operations": ["*", "/", "multi"],  # multi for multi-step problems
-        "range": (1, 12),  # Times tables up to 12
-        "description": "Multiplication & Division",
-        "encouragement": [
-            "You're becoming a math wizard!",
-            "Keep up the great work!",
-            "Amazing progress!"
-        ]
-    },
-    3: {
-        "operations": ["frac", "dec", "complex"],  # fractions, decimals, complex problems
-        "range": (1, 100),
-        "description": "Fractions & Decimals",
-        "encouragement": [
-            "Spectacular solving!",
-            "You're a math superstar!",
-            "Incredible work!"
-        ]
-    }
-}
-
-def generate_multi_step_problem() -> Tuple[str, int]:
-    """Generate a multi-step word problem."""
-    # Template 1: Buy multiple items with different quantities and prices
-    pencils = random.randint(2, 5)
-    pencil_cost = random.randint(2, 5)
-    notebooks = random.randint(2, 4)
-    notebook_cost = random.randint(3, 6)
-    total_cost = (pencils * pencil_cost) + (notebooks * notebook_cost)
+def generate_problem(level: int, difficulty: int = None) -> Problem:
+    """Generate a random math problem based on the level.
+
+    Problems come from the problem bank when one has been built; the difficulty
+    only applies to bank problems.
+    """
+    if problem_bank is not None:
+        problem = problem_bank.sample(level, difficulty)
+        if problem is not None:
+            return problem
+    level_info = LEVELS[level]
+    return OPERATIONS[random.choice(level_info["operations"])].generate(level_info["range"])
+
+class QuestionText(NamedTuple):
+    """A problem's text, wrapped and rendered, ready to blit onto the game scene."""
+    question: str
+    lines: Tuple[pygame.Surface, ...]
+    wrapped: bool  # Word problem: the lines are followed by a "= ?" line
+
+def render_question(question: str, font=FONT) -> QuestionText:
+    """Wrap and render a problem's text (the prefetch thread does this with its own font)."""
+    if len(question) > 50:  # If it's a longer word problem
+        lines, wrapped = wrap_question(question) + ["= ?"], True
+    else:
+        lines, wrapped = [f"Problem: {question} = ?"], False
+    return QuestionText(question, tuple(font.render(line, True, BLACK) for line in lines), wrapped)
+
+def build_problem(operation: str, operands: tuple) -> Problem:
+    """Rebuild a problem from a stored operation and operands (used for reviews)."""
+    return OPERATIONS[operation].build(operands)
+
+def draw_text(text: str, x: int, y: int, color: Tuple[int, int, int] = BLACK, font=FONT, surface: pygame.Surface = None) -> None:
+    """Render text on the screen (or onto a layer surface)."""
+    if surface is None:
+        surface = screen
+    text_surface = font.render(str(text), True, color)
+    surface.blit(text_surface, (x, y))
+
+class Layer:
+    """A pre-composited surface that is only rebuilt when its inputs change.
+
+    ``build`` is called with the layer's inputs and its result is cached until
+    ``get`` is called with different inputs, so static backgrounds cost a single
+    blit per frame instead of a stack of fills, renders and sprite blits.
+    """
+
+    def __init__(self, build):
+        self._build = build
+        self._key = None
+        self._value = None
+
+    def get(self, *key):
+        """Return the cached layer for these inputs, rebuilding it if they changed."""
+        if self._value is None or key != self._key:
+            self._value = self._build(*key)
+            self._key = key
+        return self._value
+
+    def invalidate(self) -> None:
+        """Force the next get() to rebuild the layer."""
+        self._value = None
+
+def new_layer_surface(width: int = WIDTH, height: int = HEIGHT) -> pygame.Surface:
+    """Create an opaque surface in the display's pixel format for fast blitting."""
+    return pygame.Surface((width, height)).convert()
+
+# Fixed layouts, computed once instead of every frame
+LEVEL_BUTTON_FONT = pygame.font.Font(None, 34)  # Smaller font for level buttons
+MENU_START_BUTTON = pygame.Rect(WIDTH//2 - 100, HEIGHT - 200, 200, 50)
+MENU_LEVEL_SELECT_BUTTON = pygame.Rect(WIDTH//2 - 100, HEIGHT - 130, 200, 50)
+MENU_PLAYER_BUTTON = pygame.Rect(WIDTH//2 - 100, HEIGHT - 60, 200, 50)
+NEW_PLAYER_INPUT_RECT = pygame.Rect(WIDTH//2 - 150, 380, 300, 50)
+PLAYER_BACK_BUTTON = pygame.Rect(WIDTH//2 - 100, HEIGHT - 90, 200, 50)
+MAX_LISTED_PLAYERS = 6
+HEADER_HEIGHT = 100
+NAME_INPUT_RECT = pygame.Rect(WIDTH//2 - 150, 260, 300, 50)
+CONTINUE_BUTTON = pygame.Rect(WIDTH//2 - 100, HEIGHT - 150, 200, 50)
+RESUME_BUTTON = pygame.Rect(WIDTH//2 - 220, HEIGHT - 150, 200, 50)
+NEW_GAME_BUTTON = pygame.Rect(WIDTH//2 + 20, HEIGHT - 150, 200, 50)
+
+def layout_level_buttons() -> Tuple[List[Tuple[pygame.Rect, int]], pygame.Rect]:
+    """Return the level-select buttons as (rect, level) pairs and the back button rect."""
+    # Even wider buttons for the level descriptions
+    button_height = 70
+    button_width = 600
+    button_spacing = 25
+    total_buttons = len(LEVELS)
+    total_height = (button_height * total_buttons) + (button_spacing * (total_buttons - 1))
+    start_y = (HEIGHT - total_height) // 2
     
-    question = (
-        f"{FAMILY['player']} buys {pencils} magical pencils for {pencil_cost} coins each "
-        f"and {notebooks} notebooks for {notebook_cost} coins each. "
-        "How many coins did she spend in total?"
-    )
-    return question, total_cost
-
-def generate_fraction_problem() -> Tuple[str, float]:
-    """Generate a fraction word problem."""
-    # Common fractions that make sense in recipes and measurements
-    fractions = [
-        (1, 2, "1/2"),  # half
-        (1, 4, "1/4"),  # quarter
-        (3, 4, "3/4"),  # three-quarters
-        (1, 3, "1/3"),  # third
-        (2, 3, "2/3")   # two-thirds
-    ]
+    level_buttons = []
+    for level in LEVELS:
+        level_buttons.append((pygame.Rect(WIDTH//2 - button_width//2, start_y, button_width, button_height), level))
+        start_y += button_height + button_spacing
     
-    templates = [
-        # Recipe scaling
-        lambda frac, multiplier: (
-            f"A recipe calls for {frac[2]} cup of sugar. "
-            f"If {FAMILY['player']} wants to make {multiplier} times the recipe, "
-            "how many cups of sugar does she need?"
-        ),
-        # Pizza sharing
-        lambda frac, multiplier: (
-            f"Each fairy eats {frac[2]} of a magical pizza. "
-            f"If there are {multiplier} fairies, how many whole pizzas are needed?"
-        ),
-        # Paint mixing
-        lambda frac, multiplier: (
-            f"To make sparkly paint, you need {frac[2]} cup of glitter per batch. "
-            f"If you want to make {multiplier} batches, how many cups of glitter do you need?"
-        ),
-        # Garden planning
-        lambda frac, multiplier: (
-            f"Each rainbow flower needs {frac[2]} cup of magical water daily. "
-            f"If you have {multiplier} rainbow flowers, how many cups of water do you need?"
-        ),
-        # Potion making
-        lambda frac, multiplier: (
-            f"A unicorn potion requires {frac[2]} cup of starlight. "
-            f"To make {multiplier} potions, how many cups of starlight are needed?"
-        )
-    ]
+    # Back button with fixed spacing from bottom
+    back_button = pygame.Rect(WIDTH//2 - 100, HEIGHT - button_height - 20, 200, 50)
+    return level_buttons, back_button
+
+LEVEL_BUTTONS, LEVEL_BACK_BUTTON = layout_level_buttons()
+
+def layout_player_buttons(count: int) -> List[pygame.Rect]:
+    """Return rects for up to MAX_LISTED_PLAYERS profile buttons in two columns."""
+    return [pygame.Rect(WIDTH//2 - 260 + (i % 2) * 270, 130 + (i // 2) * 65, 250, 50) for i in range(count)]
+
+def layout_game_over_buttons(score_count: int) -> Tuple[pygame.Rect, pygame.Rect]:
+    """Return the save and play-again button rects below the high score list."""
+    high_score_start_y = 340
+    line_height = 35
+    last_line_y = high_score_start_y + 40  # Default if no scores
+    if score_count:
+        last_line_y = high_score_start_y + 40 + (score_count - 1) * line_height
+    button_y = min(last_line_y + 60, HEIGHT - 80)  # Ensure buttons don't go off screen
+    return (pygame.Rect(WIDTH//2 - 220, button_y, 200, 50),
+            pygame.Rect(WIDTH//2 + 20, button_y, 200, 50))
+
+def layout_high_score_labels() -> List[Tuple[Label, Label]]:
+    """Return (name and score, date) label pairs for the five high score lines."""
+    high_score_start_y = 340
+    line_height = 35
+    rows = []
+    for i in range(5):
+        line_y = high_score_start_y + 40 + i * line_height
+        rows.append((Label((WIDTH//2 - 150, line_y, 250, 30), SMALL_FONT, "{}: {}"),
+                     Label((WIDTH//2 + 100, line_y, 250, 30), SMALL_FONT, "({})")))
+    return rows
+
+def show_high_scores(high_scores: tuple, score_labels: List[Tuple[Label, Label]],
+                     save_button: Button, play_again: Button) -> None:
+    """Fill the high score labels and move the buttons below the last score."""
+    for i, (score_label, date_label) in enumerate(score_labels):
+        visible = i < len(high_scores)
+        score_label.set_visible(visible)
+        date_label.set_visible(visible)
+        if visible:
+            player, player_score, date = high_scores[i]
+            score_label.set(player, player_score)
+            date_label.set(date)
+    save_rect, play_again_rect = layout_game_over_buttons(len(high_scores))
+    save_button.set_rect(save_rect)
+    play_again.set_rect(play_again_rect)
+
+def wrap_question(question: str) -> List[str]:
+    """Split a long word problem into lines of at most 40 characters."""
+    words = question.split()
+    lines = []
+    current_line = []
     
-    fraction = random.choice(fractions)  # (numerator, denominator, display_string)
-    multiplier = random.randint(2, 4)
-    total = (fraction[0] / fraction[1]) * multiplier
+    for word in words:
+        current_line.append(word)
+        if len(' '.join(current_line)) > 40:  # Max chars per line
+            if len(current_line) > 1:
+                current_line.pop()
+                lines.append(' '.join(current_line))
+                current_line = [word]
+            else:
+                lines.append(' '.join(current_line))
+                current_line = []
     
-    question = random.choice(templates)(fraction, multiplier)
-    return question, total
-
-def generate_decimal_problem() -> Tuple[str, float]:
-    """Generate a decimal word problem."""
-    # Common price points that make sense
-    prices = [
-        (1.50, 0.25),  # $1.50 total, $0.25 each
-        (2.00, 0.50),  # $2.00 total, $0.50 each
-        (5.00, 1.25),  # $5.00 total, $1.25 each
-        (10.00, 2.50), # $10.00 total, $2.50 each
-        (7.50, 1.50)   # $7.50 total, $1.50 each
-    ]
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+def build_menu_layer(player_name: str) -> pygame.Surface:
+    """Compose the main menu background: unicorn and title."""
+    layer = new_layer_surface()
+    layer.fill(PINK)
     
-    templates = [
-        # Sticker buying
-        lambda total, unit: (
-            f"{FAMILY['player']} has ${total:.2f} and wants to buy unicorn stickers "
-            f"that cost ${unit:.2f} each. How many stickers can she buy?"
-        ),
-        # Ribbon measuring
-        lambda total, unit: (
-            f"A magical ribbon is {total:.2f} meters long. If each unicorn needs "
-            f"{unit:.2f} meters for their mane, how many unicorns can decorate their manes?"
-        ),
-        # Crystal collecting
-        lambda total, unit: (
-            f"{FAMILY['player']} found {total:.2f} grams of magic fairy crystal dust. "
-            f"If each necklace needs {unit:.2f} grams, how many necklaces can she make?"
-        ),
-        # Rainbow paint
-        lambda total, unit: (
-            f"The fairy store has {total:.2f} liters of rainbow paint. "
-            f"If each cloud needs {unit:.2f} liters to become colorful, how many clouds can be painted?"
-        ),
-        # Magic dust
-        lambda total, unit: (
-            f"{FAMILY['sister']} found {total:.2f} ounces of magic rainbow dust. "
-            f"If each spell requires {unit:.2f} ounces, how many spells can she cast?"
-        )
-    ]
+    # Draw unicorn at the top
+    unicorn_y = 50
+    layer.blit(unicorn_image, (WIDTH//2 - 75, unicorn_y))
     
-    price = random.choice(prices)  # (total amount, unit cost)
-    items = int(price[0] // price[1])
+    # Center title text below unicorn
+    title_y = unicorn_y + unicorn_image.get_height() + 20
+    title_surface = TITLE_FONT.render(f"Welcome {player_name} to", True, PURPLE)
+    subtitle_surface = TITLE_FONT.render("Unicorn Math Adventures!", True, PURPLE)
+    layer.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, title_y))
+    layer.blit(subtitle_surface, (WIDTH//2 - subtitle_surface.get_width()//2, title_y + 70))
+    return layer
+
+def build_player_picker_layer() -> pygame.Surface:
+    """Compose the profile picker background: title and the new player label."""
+    layer = new_layer_surface()
+    layer.fill(PINK)
     
-    question = random.choice(templates)(price[0], price[1])
-    return question, items
+    title_surface = TITLE_FONT.render("Who's Playing?", True, PURPLE)
+    layer.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 50))
+    draw_text("New Player:", NEW_PLAYER_INPUT_RECT.x, NEW_PLAYER_INPUT_RECT.y - 40, surface=layer)
+    return layer
 
-def generate_problem(level: int) -> Tuple[str, int]:
-    """Generate a random math problem based on the level."""
-    level_info = LEVELS[level]
-    op = random.choice(level_info["operations"])
-    num_range = level_info["range"]
+def build_level_select_layer() -> pygame.Surface:
+    """Compose the level-select background."""
+    layer = new_layer_surface()
+    layer.fill(PINK)
     
-    # Special problem types for Level 2 and 3
-    if op == "multi":
-        return generate_multi_step_problem()
-    elif op == "frac":
-        return generate_fraction_problem()
-    elif op == "dec":
-        return generate_decimal_problem()
-    elif op == "complex":
-        # Randomly choose between fraction and decimal for complex problems
-        return random.choice([generate_fraction_problem, generate_decimal_problem])()
+    title_surface = TITLE_FONT.render("Select Level", True, PURPLE)
+    layer.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 50))
+    return layer
+
+def build_game_over_layer(score: int, max_streak: int) -> pygame.Surface:
+    """Compose the fixed text of the game over screen; scores, name field and buttons are widgets."""
+    layer = new_layer_surface()
+    layer.fill(PINK)
     
-    # Basic operations
-    if op == "*":
-        num1 = random.randint(1, num_range[1])
-        num2 = random.randint(1, num_range[1])
-    elif op == "/":
-        # Generate division problems that result in whole numbers
-        num2 = random.randint(1, 10)  # divisor
-        answer = random.randint(1, 10)  # quotient
-        num1 = num2 * answer  # dividend
-    else:
-        num1 = random.randint(*num_range)
-        num2 = random.randint(*num_range)
-        if op == "-":
-            # Ensure no negative results
-            num1, num2 = max(num1, num2), min(num1, num2)
+    # Draw game over message
+    title_surface = TITLE_FONT.render("Time's Up!", True, PURPLE)
+    layer.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 50))
     
-    # 50% chance of getting a word problem for basic operations
-    if random.random() < 0.5:
-        question = generate_word_problem(num1, num2, op)
-    else:
-        # Use × symbol for multiplication and ÷ for division
-        display_op = "×" if op == "*" else "÷" if op == "/" else op
-        question = f"{num1} {display_op} {num2}"
+    # Draw final score and streak
+    draw_text(f"Final Score: {score}", WIDTH//2 - 150, 120, surface=layer)
+    draw_text(f"Best Streak: {max_streak} ⭐", WIDTH//2 - 150, 160, surface=layer)
     
-    # Calculate answer
-    if op == "*":
-        answer = num1 * num2
-    elif op == "/":
-        answer = num1 // num2
-    elif op == "+":
-        answer = num1 + num2
-    else:  # op == "-"
-        answer = num1 - num2
-        
-    return question, answer
+    # Labels for the name field and high score list
+    draw_text("Enter Your Name:", WIDTH//2 - 150, 220, surface=layer)
+    draw_text("High Scores:", WIDTH//2 - 150, 340, surface=layer)
+    return layer
 
-def draw_text(text: str, x: int, y: int, color: Tuple[int, int, int] = BLACK, font=FONT) -> None:
-    """Render text on the screen."""
-    text_surface = font.render(str(text), True, color)
-    screen.blit(text_surface, (x, y))
+def build_resume_layer(player_name: str, level: int, score: int, remaining_time: int) -> pygame.Surface:
+    """Compose the resume prompt: unicorn and what the unfinished session had reached."""
+    layer = new_layer_surface()
+    layer.fill(PINK)
+    layer.blit(unicorn_image, (WIDTH//2 - 75, 50))
+    
+    title_surface = TITLE_FONT.render(f"Welcome back, {player_name}!", True, PURPLE)
+    layer.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 220))
+    for i, line in enumerate(("Your last game didn't finish.",
+                              f"Level {level}, score {score}, {remaining_time // 60}:{remaining_time % 60:02d} left")):
+        text_surface = FONT.render(line, True, BLACK)
+        layer.blit(text_surface, (WIDTH//2 - text_surface.get_width()//2, 300 + i * 45))
+    return layer
+
+def build_game_scene_layer(question_text: QuestionText, visible_rewards: int) -> Tuple[pygame.Surface, int]:
+    """Compose the game background: header bar, problem text, answer box, unicorn and rewards.
 
-def draw_button(text: str, x: int, y: int, width: int, height: int, selected: bool = False) -> pygame.Rect:
-    """Draw a button and return its rect."""
-    color = PURPLE if selected else BLACK
-    button_rect = pygame.Rect(x, y, width, height)
-    pygame.draw.rect(screen, color, button_rect, 3)
+    Returns the layer and the y position of the answer box.
+    """
+    layer = new_layer_surface()
+    layer.fill(PINK)
+    # The header's level, score, timer and streak widgets are drawn over this bar
+    pygame.draw.rect(layer, WHITE, (0, 0, WIDTH, HEADER_HEIGHT))
+    pygame.draw.line(layer, PURPLE, (0, HEADER_HEIGHT), (WIDTH, HEADER_HEIGHT), 2)
+    
+    # Draw the pre-rendered problem text, adjusted for header
+    problem_start_y = HEADER_HEIGHT + 40  # Start below header
+    if question_text.wrapped:
+        *lines, equals = question_text.lines
+        
+        # Calculate total height needed for the problem text
+        text_height = len(lines) * 40
+        problem_y = problem_start_y
+        
+        # Draw each line of the problem
+        for i, line in enumerate(lines):
+            layer.blit(line, (20, problem_y + (i * 40)))
+        layer.blit(equals, (20, problem_y + text_height + 10))
+        
+        # Answer box below the problem with padding
+        answer_y = problem_y + text_height + 60
+    else:
+        # For simple problems
+        layer.blit(question_text.lines[0], (20, 180))
+        answer_y = 230
+    pygame.draw.rect(layer, WHITE, (20, answer_y, 360, 50))
     
-    # Center text in button
-    text_surface = FONT.render(text, True, color)
-    text_rect = text_surface.get_rect(center=button_rect.center)
-    screen.blit(text_surface, text_rect)
+    # Calculate positions for images at the bottom
+    bottom_margin = 20
+    image_y = HEIGHT - unicorn_image.get_height() - bottom_margin
     
-    return button_rect
+    # Draw unicorn on right side at the bottom
+    layer.blit(unicorn_image, (WIDTH - unicorn_image.get_width() - 20, image_y))
+    
+    # Draw rewards in a single row at the bottom
+    rewards_x = 20
+    rewards_spacing = 10
+    for i in range(visible_rewards):
+        layer.blit(reward_image, (rewards_x + (i * (reward_image.get_width() + rewards_spacing)), image_y))
+    return layer, answer_y
+
+MENU_LAYER = Layer(build_menu_layer)
+LEVEL_SELECT_LAYER = Layer(build_level_select_layer)
+PLAYER_PICKER_LAYER = Layer(build_player_picker_layer)
+GAME_OVER_LAYER = Layer(build_game_over_layer)
+GAME_SCENE_LAYER = Layer(build_game_scene_layer)
+RESUME_LAYER = Layer(build_resume_layer)
+
+# Retained widgets drawn over the layers above: laid out once, redrawn only when they change
+MENU_WIDGETS = WidgetGroup([
+    Button(MENU_START_BUTTON, "Start Game", FONT, action="start"),
+    Button(MENU_LEVEL_SELECT_BUTTON, "Select Level", FONT, action="levels"),
+    Button(MENU_PLAYER_BUTTON, "Switch Player", FONT, action="player"),
+])
+LEVEL_SELECT_WIDGETS = WidgetGroup(
+    [Button(rect, f"Level {level}: {LEVELS[level]['description']}", LEVEL_BUTTON_FONT, action=level)
+     for rect, level in LEVEL_BUTTONS]
+    + [Button(LEVEL_BACK_BUTTON, "Back", FONT, action="back")]
+)
+
+# Game header: the timer is right-aligned in room for its widest text, so the streak
+# counters and progress bar to its left keep a fixed position
+TIMER_WIDTH = FONT.size("Time: 5:00")[0]
+STREAK_X = WIDTH - TIMER_WIDTH - 20 - 200
+LEVEL_LABEL = Label((20, 20, WIDTH - TIMER_WIDTH - 60, 35), FONT, "Level {}: {}")
+SCORE_LABEL = Label((20, 55, STREAK_X - 30, 35), FONT, "Score: {}")
+TIMER_LABEL = Label((WIDTH - TIMER_WIDTH - 20, 20, TIMER_WIDTH, 35), FONT, "Time: {}:{:02d}", align="right")
+STREAK_LABEL = Label((STREAK_X, 20, 190, 25), SMALL_FONT, "Streak: {} 🔥")
+BEST_LABEL = Label((STREAK_X, 50, 190, 25), SMALL_FONT, "Best: {} ⭐")
+PROGRESS_BAR = ProgressBar((STREAK_X, 75, 150, 15), PURPLE)
+ANSWER_LABEL = Label((30, 240, WIDTH - 30, 35), FONT, "Your Answer: {} {}")  # Moved into each answer box
+MESSAGE_LABEL = Label((0, HEIGHT - 80, WIDTH, 35), FONT, color=PURPLE, align="center")
+CONTINUE_WIDGET = Button(CONTINUE_BUTTON, "Continue", FONT)
+GAME_WIDGETS = WidgetGroup([LEVEL_LABEL, SCORE_LABEL, TIMER_LABEL, STREAK_LABEL, BEST_LABEL, PROGRESS_BAR,
+                            ANSWER_LABEL, MESSAGE_LABEL, CONTINUE_WIDGET])
+
+def choose_player() -> str:
+    """Show the profile picker and return the chosen player's name ("" if the window was closed)."""
+    players = profile_store.recent_players(MAX_LISTED_PLAYERS)
+    # Each profile button's action is the player's name
+    player_buttons = [Button(rect, name, FONT, action=name, selected=name == FAMILY["player"])
+                      for rect, (name, level) in zip(layout_player_buttons(len(players)), players)]
+    name_input = TextInput(NEW_PLAYER_INPUT_RECT, FONT)
+    back_button = Button(PLAYER_BACK_BUTTON, "Back", FONT)
+    widgets = WidgetGroup(player_buttons + [name_input, back_button])
+    
+    while True:
+        widgets.draw(screen, PLAYER_PICKER_LAYER.get())
+        pygame.display.flip()
+        
+        for event in get_events():
+            if event.type == pygame.QUIT:
+                return ""
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                clicked = widgets.widget_at(event.pos)
+                name_input.set_active(clicked is name_input)
+                if clicked is back_button:
+                    return FAMILY["player"]
+                if clicked in player_buttons:
+                    return clicked.action
+            elif event.type == pygame.KEYDOWN and name_input.active:
+                if name_input.handle_key(event) and name_input.text.strip():
+                    return profile_store.create_player(name_input.text.strip()).name
+        
+        if allocation_profiler:
+            allocation_profiler.frame("choose_player")
+        clock.tick(30)
+
+def select_player(name: str) -> int:
+    """Make a profile the active player and return the level it left off at."""
+    profile = profile_store.get_player(name) or profile_store.create_player(name)
+    profile_store.touch_player(profile.name)
+    if FAMILY["player"] != profile.name:
+        FAMILY["player"] = profile.name
+        problem_prefetcher.invalidate()  # Prefetched word problems use the old player's name
+    return profile.current_level
 
 def main_menu() -> Tuple[bool, int]:
     """Display the main menu and return (should_start, selected_level)."""
-    selected_level = 1
+    selected_level = select_player(FAMILY["player"])
     in_level_select = False
     
     while True:
-        screen.fill(PINK)
-        
-        # Draw unicorn at the top
-        unicorn_y = 50
-        screen.blit(unicorn_image, (WIDTH//2 - 75, unicorn_y))
-        
-        # Draw title below unicorn
-        title = f"Welcome {FAMILY['player']} to"
-        subtitle = "Unicorn Math Adventures!"
-        
-        # Center title text below unicorn
-        title_y = unicorn_y + unicorn_image.get_height() + 20
-        title_surface = TITLE_FONT.render(title, True, PURPLE)
-        subtitle_surface = TITLE_FONT.render(subtitle, True, PURPLE)
-        screen.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, title_y))
-        screen.blit(subtitle_surface, (WIDTH//2 - subtitle_surface.get_width()//2, title_y + 70))
-        
         if not in_level_select:
-            # Draw main menu options
-            start_button = draw_button("Start Game", WIDTH//2 - 100, HEIGHT - 200, 200, 50)
-            level_select_button = draw_button("Select Level", WIDTH//2 - 100, HEIGHT - 130, 200, 50)
+            MENU_WIDGETS.draw(screen, MENU_LAYER.get(FAMILY["player"]))
         else:
-            # Clear previous title and image
-            screen.fill(PINK)
-            
-            # Draw title at the top
-            title = "Select Level"
-            title_surface = TITLE_FONT.render(title, True, PURPLE)
-            screen.blit(title_surface, (WIDTH//2 - title_surface.get_width()//2, 50))
-            
-            # Calculate button layout with even wider buttons
-            button_height = 70
-            button_width = 600
-            button_spacing = 25
-            level_select_font = pygame.font.Font(None, 34)  # Even smaller font for level buttons
-            total_buttons = len(LEVELS)
-            total_height = (button_height * total_buttons) + (button_spacing * (total_buttons - 1))
-            start_y = (HEIGHT - total_height) // 2
-            
-            # Draw level selection buttons
-            level_buttons = []
-            for level in LEVELS:
-                text = f"Level {level}: {LEVELS[level]['description']}"
-                # Use smaller font for level buttons
-                button_rect = pygame.Rect(WIDTH//2 - button_width//2, start_y, button_width, button_height)
-                pygame.draw.rect(screen, PURPLE if level == selected_level else BLACK, button_rect, 3)
-                
-                # Center text in button with smaller font
-                text_surface = level_select_font.render(text, True, PURPLE if level == selected_level else BLACK)
-                text_rect = text_surface.get_rect(center=button_rect.center)
-                screen.blit(text_surface, text_rect)
-                
-                level_buttons.append((button_rect, level))
-                start_y += button_height + button_spacing
-            
-            # Draw back button with fixed spacing from bottom
-            back_button = draw_button("Back", WIDTH//2 - 100, HEIGHT - button_height - 20, 200, 50)
+            LEVEL_SELECT_WIDGETS.draw(screen, LEVEL_SELECT_LAYER.get())
         
         pygame.display.flip()
         
-        for event in pygame.event.get():
+        for event in get_events():
             if event.type == pygame.QUIT:
                 return False, 1
             
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mouse_pos = pygame.mouse.get_pos()
+                widgets = LEVEL_SELECT_WIDGETS if in_level_select else MENU_WIDGETS
+                clicked = widgets.widget_at(event.pos)
+                action = clicked.action if clicked else None
                 
                 if not in_level_select:
-                    if start_button.collidepoint(mouse_pos):
+                    if action == "start":
                         return True, selected_level
-                    elif level_select_button.collidepoint(mouse_pos):
+                    elif action == "levels":
                         in_level_select = True
+                        for button in LEVEL_SELECT_WIDGETS.widgets:
+                            button.set_selected(button.action == selected_level)
+                    elif action == "player":
+                        name = choose_player()
+                        if not name:
+                            return False, 1
+                        selected_level = select_player(name)
                 else:
-                    if back_button.collidepoint(mouse_pos):
+                    if action == "back":
                         in_level_select = False
-                    else:
-                        for button, level in level_buttons:
-                            if button.collidepoint(mouse_pos):
-                                selected_level = level
-                                in_level_select = False  # Return to main menu after selection
+                    elif action in LEVELS:
+                        selected_level = action
+                        in_level_select = False  # Return to main menu after selection
         
+        if allocation_profiler:
+            allocation_profiler.frame("main_menu")
         clock.tick(30)
 
-def draw_progress_bar(surface: pygame.Surface, x: int, y: int, width: int, height: int, progress: float, color: Tuple[int, int, int]) -> None:
-    """Draw a progress bar showing level completion."""
-    pygame.draw.rect(surface, BLACK, (x, y, width, height), 2)
-    if progress > 0:
-        inner_width = int((width - 4) * progress)
-        pygame.draw.rect(surface, color, (x + 2, y + 2, inner_width, height - 4))
-
-def reset_game_state(starting_level: int) -> dict:
+def reset_game_state(starting_level: int) -> GameState:
     """Reset and return all game state variables"""
-    return {
-        "streak": 0,
-        "max_streak": 0,
-        "progress": 0,
-        "wrong_attempts": 0,
-        "showing_answer": False,
-        "continue_button": None,
-        "level": starting_level,
-        "score": 0,
-        "previous_question": "",
-        "user_answer": "",
-        "reward_count": 0,
-        "message": "",
-        "message_timer": 0,
-        "question": None,
-        "answer": None
-    }
-
-def game_loop(starting_level: int) -> bool:
-    """Run the main game loop and return True if player wants to play again."""
+    return GameState(starting_level)
+
+def record_session(state: GameState) -> None:
+    """Save a finished session to the active player's profile."""
+    if state.operation_totals:
+        profile_store.record_session(FAMILY["player"], state.started, state.starting_level,
+                                     state.level, state.score, state.max_streak,
+                                     state.level_bests, state.operation_totals)
+
+def get_review_scheduler(player_name: str) -> ReviewScheduler:
+    """Open (once per run) the spaced-repetition review queue for a player."""
+    if player_name not in review_schedulers:
+        file_name = "".join(c if c.isalnum() else "_" for c in player_name) or "player"
+        review_schedulers[player_name] = ReviewScheduler(os.path.join(REVIEWS_PATH, f"{file_name}.jsonl"))
+    return review_schedulers[player_name]
+
+def streak_difficulty(streak: int) -> int:
+    """Problems get harder as the streak builds toward the level up at 10."""
+    return DIFFICULTIES[min(streak * len(DIFFICULTIES) // 10, len(DIFFICULTIES) - 1)]
+
+def prefetch_problem(key: Tuple[int, int]) -> Tuple[Problem, QuestionText]:
+    """Make a problem for a (level, difficulty) and render its text (runs on the prefetch thread)."""
+    problem = generate_problem(*key)
+    return problem, render_question(problem.question, PREFETCH_FONT)
+
+# Ready-made problems for the current level, one queue per difficulty, filled on a worker thread
+PREFETCH_FONT = pygame.font.Font(None, 40)  # Same as FONT; only the prefetch thread renders with it
+PREFETCH_KEYS = {level: tuple((level, difficulty) for difficulty in DIFFICULTIES) for level in LEVELS}
+problem_prefetcher = ProblemPrefetcher(prefetch_problem)
+
+def next_problem(state: GameState, review: ReviewScheduler) -> QuestionText:
+    """Move on to the next problem: a due review when one is ready, otherwise a new one.
+
+    New problems are popped from the prefetch queue when it has one ready;
+    returns the problem's rendered text.
+    """
+    previous_question = state.question
+    problem_prefetcher.watch(PREFETCH_KEYS[state.level])  # A level change drops the old level's problems
+    due = review.next_due(state.level) if state.problems_since_review >= REVIEW_SPACING else None
+    question_text = None
+    if due is not None:
+        problem = build_problem(due.operation, due.operands)
+        state.problems_since_review = 0
+    else:
+        difficulty = streak_difficulty(state.streak)
+        prefetched = problem_prefetcher.pop((state.level, difficulty))
+        if prefetched is not None and prefetched[0].question != previous_question:
+            problem, question_text = prefetched
+        else:
+            problem = generate_problem(state.level, difficulty)
+            while problem.question == previous_question:  # Avoid repeating the same question
+                problem = generate_problem(state.level, difficulty)
+        state.problems_since_review += 1
+    state.previous_question = previous_question
+    state.problem = problem
+    state.question, state.answer = problem.question, problem.answer
+    state.wrong_attempts = 0
+    state.user_answer = ""
+    return question_text or render_question(problem.question)
+
+def game_loop(starting_level: int, resume: Optional[Checkpoint] = None) -> bool:
+    """Run the main game loop and return True if player wants to play again.
+
+    With a checkpoint, the first game picks up that session where it stopped.
+    """
     while True:
-        # Initialize game state
-        state = reset_game_state(starting_level)
-        state["question"], state["answer"] = generate_problem(state["level"])
+        if resume is not None:
+            # Restore the saved state and the time already played
+            state, elapsed_ms = resume.state, resume.elapsed_ms
+            starting_level = state.starting_level
+            resume = None
+        else:
+            # Initialize game state
+            state, elapsed_ms = reset_game_state(starting_level), 0
+        review = get_review_scheduler(FAMILY["player"])
+        if state.problem is None:
+            question_text = next_problem(state, review)
+        else:
+            question_text = render_question(state.question)
         
         # Start game loop
         running = True
-        start_time = pygame.time.get_ticks()
+        start_time = game_ticks() - elapsed_ms
+        frame_dt = 0.0
+        particles.clear()
         
         while running:
-            screen.fill(WHITE)
-            current_time = pygame.time.get_ticks()
+            current_time = game_ticks()
             
             # Check if time's up
-            remaining_time = max(0, 300 - (current_time - start_time) // 1000)
+            remaining_time = max(0, SESSION_SECONDS - (current_time - start_time) // 1000)
             if remaining_time <= 0:
-                restart = show_game_over(state["score"], state["max_streak"])
+                record_session(state)
+                session_checkpointer.discard()
+                restart = show_game_over(state.score, state.max_streak)
                 if restart:
                     # Reset game state and continue playing
                     break  # Break inner loop to restart game
@@ -620,238 +804,187 @@ def game_loop(starting_level: int) -> bool:
                     return False  # Return to main menu
             
             # Event handling
-            for event in pygame.event.get():
+            for event in get_events():
                 if event.type == pygame.QUIT:
+                    record_session(state)
+                    session_checkpointer.discard()
                     return False
-                if event.type == pygame.MOUSEBUTTONDOWN and state["showing_answer"] and state["continue_button"]:
-                    if state["continue_button"].collidepoint(event.pos):
+                if event.type == pygame.MOUSEBUTTONDOWN and state.showing_answer:
+                    if GAME_WIDGETS.widget_at(event.pos) is CONTINUE_WIDGET:
                         # Reset state and generate new question
-                        state["showing_answer"] = False
-                        state["wrong_attempts"] = 0
-                        state["continue_button"] = None
-                        state["previous_question"] = state["question"]
-                        state["question"], state["answer"] = generate_problem(state["level"])
-                        while state["question"] == state["previous_question"]:
-                            state["question"], state["answer"] = generate_problem(state["level"])
-                        state["user_answer"] = ""
-                elif event.type == pygame.KEYDOWN and not state["showing_answer"]:
-                    if event.key == pygame.K_RETURN and state["user_answer"]:
-                        # Check answer based on level type
+                        state.showing_answer = False
+                        question_text = next_problem(state, review)
+                elif event.type == pygame.KEYDOWN and not state.showing_answer:
+                    if event.key == pygame.K_RETURN and state.user_answer:
+                        # Check answer based on the problem's answer type
                         try:
-                            correct = False
-                            
-                            # Handle fraction inputs (e.g., "4/3" or "1 1/3")
-                            if "/" in state["user_answer"] and state["level"] == 3:
-                                parts = state["user_answer"].split()
-                                if len(parts) > 1:  # Mixed number (e.g., "1 1/3")
-                                    whole = int(parts[0])
-                                    num, denom = map(int, parts[1].split("/"))
-                                    user_value = whole + (num / denom)
-                                else:  # Improper fraction (e.g., "4/3")
-                                    num, denom = map(int, state["user_answer"].split("/"))
-                                    user_value = num / denom
-                                # For fraction problems, compare the actual values
-                                correct = abs(user_value - state["answer"]) < 0.01
-                            else:
-                                # For non-fraction problems, convert to appropriate type
-                                user_value = float(state["user_answer"]) if state["level"] == 3 else int(state["user_answer"])
-                                if isinstance(state["answer"], float):
-                                    # For decimal problems, allow small differences
-                                    correct = abs(user_value - state["answer"]) < 0.01
-                                else:
-                                    correct = user_value == state["answer"]
+                            correct = check_answer(OPERATIONS[state.problem.operation], state.user_answer, state.answer)
                             
+                            problem = state.problem
+                            # Per-operation totals: [attempts, correct, misses]
+                            totals = state.operation_totals.setdefault(problem.operation, [0, 0, 0])
+                            totals[0] += 1
                             if correct:
+                                totals[1] += 1
+                                
+                                # Grade the fact for spaced repetition (5 = first try)
+                                review.grade(problem.operation, problem.operands, problem.answer,
+                                             state.level, 5 - state.wrong_attempts)
+                                
                                 # Correct answer handling
-                                state["score"] += 10 * (1 + state["streak"] // 5)  # Bonus points for streaks
-                                state["streak"] += 1
-                                state["max_streak"] = max(state["streak"], state["max_streak"])
-                                state["reward_count"] += 1
-                                state["progress"] = state["streak"] / 10  # Update progress (10 streak needed for level up)
+                                state.score += 10 * (1 + state.streak // 5)  # Bonus points for streaks
+                                state.streak += 1
+                                state.max_streak = max(state.streak, state.max_streak)
+                                state.level_bests[state.level] = max(state.streak, state.level_bests.get(state.level, 0))
+                                state.reward_count += 1
+                                state.progress = state.streak / 10  # Update progress (10 streak needed for level up)
+                                
+                                # Sparkle on the newest rainbow reward
+                                reward_slot = min(state.reward_count, 5) - 1
+                                particles.sparkle(20 + reward_slot * (reward_image.get_width() + 10) + reward_image.get_width() // 2,
+                                                  HEIGHT - 20 - unicorn_image.get_height() + reward_image.get_height() // 2)
                                 
                                 # Play appropriate sound effects
-                                if state["streak"] > 0 and state["streak"] % 5 == 0:  # Streak milestone (5, 10, etc.)
+                                if state.streak > 0 and state.streak % 5 == 0:  # Streak milestone (5, 10, etc.)
                                     streak_milestone_sound.play()
-                                    state["message"] = f"🔥 {state['streak']} STREAK! AMAZING! 🔥"
+                                    state.message = f"🔥 {state.streak} STREAK! AMAZING! 🔥"
+                                    particles.rainbow_burst(WIDTH // 2, HEIGHT - 80)
                                     
                                     # Level up at streak of 10
-                                    if state["streak"] % 10 == 0 and state["level"] < max(LEVELS.keys()):
-                                        state["level"] += 1
+                                    if state.streak % 10 == 0 and state.level < max(LEVELS.keys()):
+                                        state.level += 1
                                         level_complete_sound.play()
-                                        state["message"] = f"🌟 Level Up! Now trying {LEVELS[state['level']]['description']}! 🌟"
-                                        state["message_timer"] = current_time + 3000
-                                        state["progress"] = 0
+                                        particles.star_burst(WIDTH, HEIGHT)
+                                        state.message = f"🌟 Level Up! Now trying {LEVELS[state.level]['description']}! 🌟"
+                                        state.message_timer = current_time + 3000
+                                        state.progress = 0
                                 else:
                                     correct_sound.play()
-                                    state["message"] = f"{random.choice(LEVELS[state['level']]['encouragement'])} ({state['streak']} streak!)"
+                                    state.message = f"{random.choice(LEVELS[state.level]['encouragement']).format(**FAMILY)} ({state.streak} streak!)"
                                 
                                 # Progress bar increase sound
                                 progress_sound.play()
                                 
-                                state["message_timer"] = current_time + 2000
+                                state.message_timer = current_time + 2000
                                 
-                                # Generate new question, ensuring it's different from the previous one
-                                state["previous_question"] = state["question"]
-                                state["question"], state["answer"] = generate_problem(state["level"])
-                                while state["question"] == state["previous_question"]:  # Avoid repeating the same question
-                                    state["question"], state["answer"] = generate_problem(state["level"])
+                                # Next question: a due review or a new one different from the previous one
+                                question_text = next_problem(state, review)
                             else:
                                 wrong_sound.play()
-                                state["wrong_attempts"] += 1
-                                if state["wrong_attempts"] >= 3:
-                                    state["showing_answer"] = True
-                                    state["message"] = f"The correct answer is: {state['answer']}"
-                                    state["message_timer"] = current_time + 5000  # Show for 5 seconds
+                                state.wrong_attempts += 1
+                                if state.wrong_attempts >= 3:
+                                    totals[2] += 1
+                                    # Queue the missed fact for spaced review
+                                    review.grade(problem.operation, problem.operands, problem.answer,
+                                                 state.level, 1)
+                                    state.showing_answer = True
+                                    state.message = f"The correct answer is: {state.answer}"
+                                    state.message_timer = current_time + 5000  # Show for 5 seconds
                                     # Level down if not at level 1
-                                    if state["level"] > 1:
-                                        state["level"] = max(1, state["level"] - 1)
-                                        state["message"] = f"Let's try {LEVELS[state['level']]['description']} problems! The answer was {state['answer']}"
-                                    # Add continue button
-                                    state["continue_button"] = pygame.Rect(WIDTH//2 - 100, HEIGHT - 150, 200, 50)
+                                    if state.level > 1:
+                                        state.level = max(1, state.level - 1)
+                                        state.message = f"Let's try {LEVELS[state.level]['description']} problems! The answer was {state.answer}"
                                 else:
-                                    state["message"] = f"Try again! ({state['wrong_attempts']}/3) 💫"
-                                state["message_timer"] = current_time + 2000
-                                state["streak"] = 0  # Reset streak on wrong answer
-                                state["reward_count"] = 0  # Reset reward count on wrong answer
-                                state["progress"] = state["streak"] / 10  # Update progress bar on wrong answer too
-                            state["user_answer"] = ""
+                                    state.message = f"Try again! ({state.wrong_attempts}/3) 💫"
+                                state.message_timer = current_time + 2000
+                                state.streak = 0  # Reset streak on wrong answer
+                                state.reward_count = 0  # Reset reward count on wrong answer
+                                state.progress = state.streak / 10  # Update progress bar on wrong answer too
+                            state.user_answer = ""
                         except ValueError:
-                            state["user_answer"] = ""
+                            state.user_answer = ""
                     elif event.key == pygame.K_BACKSPACE:
-                        state["user_answer"] = state["user_answer"][:-1]
-                    elif len(state["user_answer"]) < 15:  # Allow longer answers for mixed numbers
-                        # Allow digits for all levels
-                        if event.unicode.isdigit():
-                            state["user_answer"] += event.unicode
-                        # Allow decimal point, forward slash, and space for Level 3
-                        elif state["level"] == 3 and event.unicode in [".", "/", " "]:
-                            # Handle space separately
-                            if event.unicode == " ":
-                                # Only allow one space and only if there's already some input
-                                if " " not in state["user_answer"] and state["user_answer"]:
-                                    state["user_answer"] += " "
-                            # Handle decimal point and slash
-                            else:
-                                # Split by space to check last part
-                                parts = state["user_answer"].split()
-                                # If no parts or the last part doesn't contain the symbol yet
-                                if not parts or event.unicode not in parts[-1]:
-                                    state["user_answer"] += event.unicode
-            
-            # Draw game state
-            screen.fill(PINK)
-            
-            # Create white header bar
-            header_height = 100
-            pygame.draw.rect(screen, WHITE, (0, 0, WIDTH, header_height))
-            pygame.draw.line(screen, PURPLE, (0, header_height), (WIDTH, header_height), 2)
-            
-            # Draw level and score in top left
-            draw_text(f"Level {state['level']}: {LEVELS[state['level']]['description']}", 20, 20)
-            draw_text(f"Score: {state['score']}", 20, 55)
-            
-            # Layout for header elements (right side)
-            right_margin = 20
-            timer_section_width = 150  # Width reserved for timer
-            streak_section_width = 200  # Width reserved for streak counters
-            
-            # Draw timer in far right
-            minutes = remaining_time // 60
-            seconds = remaining_time % 60
-            timer_text = f"Time: {minutes}:{seconds:02d}"
-            timer_surface = FONT.render(timer_text, True, BLACK)
-            timer_x = WIDTH - timer_surface.get_width() - right_margin
-            screen.blit(timer_surface, (timer_x, 20))
+                        state.user_answer = state.user_answer[:-1]
+                    elif len(state.user_answer) < 15 and event.unicode:  # Allow longer answers for mixed numbers
+                        # The problem's answer type decides which characters are allowed
+                        state.user_answer = type_char(OPERATIONS[state.problem.operation], state.user_answer, event.unicode)
             
-            # Draw streak counters to the left of timer
-            streak_x = timer_x - streak_section_width
-            if state["streak"] > 0:
-                streak_text = f"Streak: {state['streak']} 🔥"
-                text_surface = SMALL_FONT.render(streak_text, True, BLACK)
-                screen.blit(text_surface, (streak_x, 20))
-            if state["max_streak"] > 0:
-                best_text = f"Best: {state['max_streak']} ⭐"
-                text_surface = SMALL_FONT.render(best_text, True, BLACK)
-                screen.blit(text_surface, (streak_x, 50))
+            # Hand a snapshot to the checkpoint writer every few seconds (it writes on its own thread)
+            session_checkpointer.save(state, FAMILY["player"], current_time - start_time)
             
-            # Draw progress bar below streak counters
-            progress_width = 150
-            progress_x = streak_x
-            draw_progress_bar(screen, progress_x, 75, progress_width, 15, state["progress"], PURPLE)
-            
-            # Draw problem with word wrapping if needed, adjusted for header
-            problem_start_y = header_height + 40  # Start below header
-            if len(state["question"]) > 50:  # If it's a longer word problem
-                words = state["question"].split()
-                lines = []
-                current_line = []
-                
-                for word in words:
-                    current_line.append(word)
-                    if len(' '.join(current_line)) > 40:  # Max chars per line
-                        if len(current_line) > 1:
-                            current_line.pop()
-                            lines.append(' '.join(current_line))
-                            current_line = [word]
-                        else:
-                            lines.append(' '.join(current_line))
-                            current_line = []
-                
-                if current_line:
-                    lines.append(' '.join(current_line))
-                
-                # Calculate total height needed for the problem text
-                text_height = len(lines) * 40
-                problem_y = problem_start_y
-                
-                # Draw each line of the problem
-                for i, line in enumerate(lines):
-                    draw_text(line, 20, problem_y + (i * 40))
-                draw_text("= ?", 20, problem_y + text_height + 10)
-                
-                # Draw answer box below the problem with padding
-                answer_y = problem_y + text_height + 60
-                pygame.draw.rect(screen, WHITE, (20, answer_y, 360, 50))
-                draw_text(f"Your Answer: {state['user_answer']}", 30, answer_y + 10)
-            else:
-                # For simple problems
-                draw_text(f"Problem: {state['question']} = ?", 20, 180)
-                
-                # Draw answer box with input format hint
-                pygame.draw.rect(screen, WHITE, (20, 230, 360, 50))
-                hint = "(Enter as mixed number like 1 1/3 or fraction like 4/3)" if state["level"] == 3 else ""
-                draw_text(f"Your Answer: {state['user_answer']} {hint}", 30, 240)
+            # Draw the cached scene layer with the header and message widgets over it;
+            # only widgets whose values changed this frame are redrawn
+            visible_rewards = min(state.reward_count, 5)  # Limit to 5 visible rewards
+            scene, answer_y = GAME_SCENE_LAYER.get(question_text, visible_rewards)
+            LEVEL_LABEL.set(state.level, LEVELS[state.level]['description'])
+            SCORE_LABEL.set(state.score)
+            TIMER_LABEL.set(remaining_time // 60, remaining_time % 60)
+            STREAK_LABEL.set_visible(state.streak > 0)
+            STREAK_LABEL.set(state.streak)
+            BEST_LABEL.set_visible(state.max_streak > 0)
+            BEST_LABEL.set(state.max_streak)
+            PROGRESS_BAR.set_progress(state.progress)
             
-            # Calculate positions for images at the bottom
-            bottom_margin = 20
-            image_y = HEIGHT - unicorn_image.get_height() - bottom_margin
-            
-            # Draw unicorn on right side at the bottom
-            screen.blit(unicorn_image, (WIDTH - unicorn_image.get_width() - 20, image_y))
-            
-            # Draw rewards in a single row at the bottom (max 5 visible)
-            rewards_x = 20
-            rewards_spacing = 10
-            visible_rewards = min(state["reward_count"], 5)  # Limit to 5 visible rewards
-            for i in range(visible_rewards):
-                screen.blit(reward_image, (rewards_x + (i * (reward_image.get_width() + rewards_spacing)), image_y))
+            # Answer text, with the operation's input format hint for simple problems
+            hint = OPERATIONS[state.problem.operation].hint if len(state.question) <= 50 else ""
+            ANSWER_LABEL.set_rect((30, answer_y + 10, WIDTH - 30, 35))
+            ANSWER_LABEL.set(state.user_answer, hint)
             
             # Draw message if timer is active
-            if current_time < state["message_timer"]:
-                message_surface = FONT.render(state["message"], True, PURPLE)
-                screen.blit(message_surface, (WIDTH//2 - message_surface.get_width()//2, HEIGHT - 80))
-                
+            MESSAGE_LABEL.set_visible(current_time < state.message_timer)
+            MESSAGE_LABEL.set(state.message)
+            
             # Draw continue button if showing answer
-            if state["showing_answer"] and state["continue_button"]:
-                draw_button("Continue", state["continue_button"].x, state["continue_button"].y, state["continue_button"].width, state["continue_button"].height)
+            CONTINUE_WIDGET.set_visible(state.showing_answer)
+            GAME_WIDGETS.draw(screen, scene)
+            
+            # Celebration particles advance on a fixed timestep
+            particles.update(frame_dt)
+            particles.draw(screen)
             
             pygame.display.flip()
-            clock.tick(30)
+            if allocation_profiler:
+                allocation_profiler.frame("game_loop")
+            frame_dt = clock.tick(30) / 1000
     
     return True  # Continue playing
 
+def offer_resume(checkpoint: Checkpoint) -> Optional[bool]:
+    """Ask whether to resume an unfinished session. Returns None if the window was closed."""
+    remaining = max(0, SESSION_SECONDS - checkpoint.elapsed_ms // 1000)
+    resume_button = Button(RESUME_BUTTON, "Resume", FONT)
+    new_game_button = Button(NEW_GAME_BUTTON, "New Game", FONT)
+    widgets = WidgetGroup([resume_button, new_game_button])
+    background = RESUME_LAYER.get(checkpoint.player, checkpoint.state.level, checkpoint.state.score, remaining)
+    
+    while True:
+        widgets.draw(screen, background)
+        pygame.display.flip()
+        
+        for event in get_events():
+            if event.type == pygame.QUIT:
+                return None
+            elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                clicked = widgets.widget_at(event.pos)
+                if clicked is resume_button:
+                    return True
+                if clicked is new_game_button:
+                    return False
+        
+        clock.tick(30)
+
 def main():
     """Main game entry point."""
+    # Continue as whoever played last
+    recent = profile_store.recent_players(1)
+    if recent:
+        FAMILY["player"] = recent[0][0]
+    
+    # A checkpoint left behind means the last session never finished (crash, power loss)
+    checkpoint = load_checkpoint(CHECKPOINT_FILE)
+    if checkpoint is not None:
+        resume = offer_resume(checkpoint)
+        if resume is None:
+            return
+        select_player(checkpoint.player)
+        if resume:
+            if not game_loop(checkpoint.state.starting_level, checkpoint):
+                return
+        else:
+            # Keep what was played in the profile, then start fresh
+            record_session(checkpoint.state)
+            session_checkpointer.discard()
+    
     while True:
         # Reset display and events before showing menu
         screen.fill(PINK)
@@ -870,5 +1003,9 @@ def main():
 
 if __name__ == "__main__":
     main()
+    problem_prefetcher.close()
+    session_checkpointer.close()
+    if allocation_profiler:
+        allocation_profiler.stop()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,253 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+PURPLE = (147, 112, 219)
+
+class Widget:
+    """Base retained-mode widget: a fixed rect that is only redrawn when it changes."""
+    interactive = False  # Only interactive widgets are added to the hit-test index
+
+    def __init__(self, rect, action=None):
+        self.rect = pygame.Rect(rect)
+        self.action = action  # Returned to the screen when the widget is clicked
+        self.visible = True
+        self.dirty = True
+        self.group: Optional["WidgetGroup"] = None
+        self._drawn_rect: Optional[pygame.Rect] = None  # Where it was last drawn, to clear on change
+
+    def mark_dirty(self) -> None:
+        self.dirty = True
+
+    def set_visible(self, visible: bool) -> None:
+        if visible != self.visible:
+            self.visible = visible
+            self.dirty = True
+
+    def set_rect(self, rect) -> None:
+        """Move or resize the widget; this invalidates the group's layout index."""
+        rect = pygame.Rect(rect)
+        if rect != self.rect:
+            self.rect = rect
+            self.dirty = True
+            if self.group is not None:
+                self.group.invalidate_layout()
+
+    def draw(self, surface: pygame.Surface) -> None:
+        raise NotImplementedError
+
+class Label(Widget):
+    """Text inside a fixed rect. The text is a template filled by set(), re-rendered only when the values change."""
+
+    def __init__(self, rect, font: pygame.font.Font, template: str = "{}", color=BLACK, align: str = "left"):
+        super().__init__(rect)
+        self.font = font
+        self.template = template
+        self.color = color
+        self.align = align
+        self._values = None
+        self._surface = None
+
+    def set(self, *values) -> None:
+        if values != self._values:
+            self._values = values
+            self._surface = self.font.render(self.template.format(*values), True, self.color)
+            self.dirty = True
+
+    def draw(self, surface: pygame.Surface) -> None:
+        if self._surface is None:
+            return
+        if self.align == "center":
+            pos = self._surface.get_rect(midtop=self.rect.midtop)
+        elif self.align == "right":
+            pos = self._surface.get_rect(topright=self.rect.topright)
+        else:
+            pos = self.rect.topleft
+        # Clip to the rect so the text never spills outside the area cleared on change
+        clip = surface.get_clip()
+        surface.set_clip(clip.clip(self.rect))
+        surface.blit(self._surface, pos)
+        surface.set_clip(clip)
+
+class Button(Widget):
+    """A bordered button with centered text; purple when selected."""
+    interactive = True
+
+    def __init__(self, rect, text: str, font: pygame.font.Font, action=None, selected: bool = False):
+        super().__init__(rect, action)
+        self.font = font
+        self.text = text
+        self.selected = selected
+        self._surface = None
+
+    def set_text(self, text: str) -> None:
+        if text != self.text:
+            self.text = text
+            self._surface = None
+            self.dirty = True
+
+    def set_selected(self, selected: bool) -> None:
+        if selected != self.selected:
+            self.selected = selected
+            self._surface = None
+            self.dirty = True
+
+    def draw(self, surface: pygame.Surface) -> None:
+        color = PURPLE if self.selected else BLACK
+        if self._surface is None:
+            self._surface = self.font.render(self.text, True, color)
+        pygame.draw.rect(surface, color, self.rect, 3)
+        surface.blit(self._surface, self._surface.get_rect(center=self.rect.center))
+
+class TextInput(Widget):
+    """A one-line text field with a white border while active."""
+    interactive = True
+
+    def __init__(self, rect, font: pygame.font.Font, text: str = "", max_length: int = 15, active: bool = False,
+                 action=None):
+        super().__init__(rect, action)
+        self.font = font
+        self.text = text
+        self.max_length = max_length
+        self.active = active
+        self._surface = None
+
+    def set_active(self, active: bool) -> None:
+        if active != self.active:
+            self.active = active
+            self.dirty = True
+
+    def set_text(self, text: str) -> None:
+        if text != self.text:
+            self.text = text
+            self._surface = None
+            self.dirty = True
+
+    def handle_key(self, event: pygame.event.Event) -> bool:
+        """Apply a KEYDOWN event; returns True when Enter is pressed."""
+        if event.key == pygame.K_RETURN:
+            return True
+        if event.key == pygame.K_BACKSPACE:
+            self.set_text(self.text[:-1])
+        elif len(self.text) < self.max_length and event.unicode.isprintable():
+            self.set_text(self.text + event.unicode)
+        return False
+
+    def draw(self, surface: pygame.Surface) -> None:
+        pygame.draw.rect(surface, WHITE if self.active else BLACK, self.rect, 2)
+        if self._surface is None:
+            self._surface = self.font.render(self.text, True, BLACK)
+        surface.blit(self._surface, (self.rect.x + 10, self.rect.y + 10))
+
+class ProgressBar(Widget):
+    """A bordered bar filled to a 0-1 fraction."""
+
+    def __init__(self, rect, color=PURPLE, progress: float = 0.0):
+        super().__init__(rect)
+        self.color = color
+        self.progress = progress
+
+    def set_progress(self, progress: float) -> None:
+        if progress != self.progress:
+            self.progress = progress
+            self.dirty = True
+
+    def draw(self, surface: pygame.Surface) -> None:
+        x, y, width, height = self.rect
+        pygame.draw.rect(surface, BLACK, self.rect, 2)
+        if self.progress > 0:
+            inner_width = int((width - 4) * self.progress)
+            pygame.draw.rect(surface, self.color, (x + 2, y + 2, inner_width, height - 4))
+
+class WidgetGroup:
+    """The widgets of one screen, drawn over a background layer.
+
+    The group keeps a retained canvas of background plus widgets. Each frame,
+    only the areas of dirty widgets are restored from the background and
+    redrawn, together with any widgets overlapping them. A full redraw
+    happens only when the background changes. Clicks are resolved through a
+    uniform grid of interactive widgets. The grid is rebuilt only after
+    widgets are added or moved.
+    """
+
+    def __init__(self, widgets: List[Widget] = (), cell_size: int = 100):
+        self.widgets: List[Widget] = []
+        self.cell_size = cell_size
+        self._index: Optional[Dict[Tuple[int, int], List[Widget]]] = None
+        self._background: Optional[pygame.Surface] = None
+        self._canvas: Optional[pygame.Surface] = None
+        for widget in widgets:
+            self.add(widget)
+
+    def add(self, widget: Widget) -> Widget:
+        widget.group = self
+        self.widgets.append(widget)
+        self.invalidate_layout()
+        return widget
+
+    def invalidate_layout(self) -> None:
+        self._index = None
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next draw()."""
+        self._background = None
+
+    def _build_index(self) -> Dict[Tuple[int, int], List[Widget]]:
+        index: Dict[Tuple[int, int], List[Widget]] = {}
+        size = self.cell_size
+        for widget in self.widgets:
+            if not widget.interactive:
+                continue
+            rect = widget.rect
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1):
+                for cy in range(rect.top // size, (rect.bottom - 1) // size + 1):
+                    index.setdefault((cx, cy), []).append(widget)
+        return index
+
+    def widget_at(self, pos: Tuple[int, int]) -> Optional[Widget]:
+        """Return the topmost visible interactive widget under pos."""
+        if self._index is None:
+            self._index = self._build_index()
+        candidates = self._index.get((pos[0] // self.cell_size, pos[1] // self.cell_size), ())
+        for widget in reversed(candidates):
+            if widget.visible and widget.rect.collidepoint(pos):
+                return widget
+        return None
+
+    def draw(self, surface: pygame.Surface, background: pygame.Surface) -> None:
+        """Bring the retained canvas up to date and blit it to surface."""
+        if background is not self._background or self._canvas is None:
+            # New background: redraw everything once
+            self._background = background
+            self._canvas = background.copy()
+            for widget in self.widgets:
+                widget.dirty = False
+                widget._drawn_rect = None
+                if widget.visible:
+                    widget.draw(self._canvas)
+                    widget._drawn_rect = widget.rect.copy()
+        else:
+            areas = []
+            for widget in self.widgets:
+                if widget.dirty:
+                    if widget._drawn_rect is not None:
+                        areas.append(widget._drawn_rect)
+                    if widget.visible and widget.rect != widget._drawn_rect:
+                        areas.append(widget.rect)
+            if areas:
+                canvas = self._canvas
+                for area in areas:
+                    canvas.blit(background, area, area)
+                    # Redraw everything touching the area, in order, clipped to it
+                    canvas.set_clip(area)
+                    for widget in self.widgets:
+                        if widget.visible and widget.rect.colliderect(area):
+                            widget.draw(canvas)
+                    canvas.set_clip(None)
+                for widget in self.widgets:
+                    if widget.dirty:
+                        widget.dirty = False
+                        widget._drawn_rect = widget.rect.copy() if widget.visible else None
+        surface.blit(self._canvas, (0, 0))